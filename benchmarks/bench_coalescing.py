@@ -0,0 +1,70 @@
+"""
+Measure a burst of identical concurrent read calls with and without coalescing.
+
+Fires --clients identical get_project_info, get_timeline_info and
+get_project_snapshot calls at once through
+DaVinciConnection.execute_command_async, as parallel agent tool calls would,
+and reports wall time and fake Resolve API calls per burst. The query cache
+is cleared before each burst so every burst starts cold.
+
+    python benchmarks/bench_coalescing.py --clients 20 --latency 0.0002
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_resolve
+
+
+async def burst(connection, clients, command_type, params):
+    start = time.perf_counter()
+    await asyncio.gather(*(connection.execute_command_async(command_type, params) for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--timelines", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0002, help="seconds per fake API call")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fake_resolve.install(fake_resolve.make_resolve(timelines=args.timelines, clips=100, items=10))
+    from src.davinci_resolve_mcp import single_flight
+    from src.davinci_resolve_mcp.commands.cache import command_cache
+    from src.davinci_resolve_mcp.connection import DaVinciConnection
+
+    connection = DaVinciConnection()
+    connection.connect()
+    fake_resolve.STATS.latency = args.latency
+    print(f"{args.clients} concurrent identical calls, {args.latency * 1e6:.0f} us per API call")
+    print(f"{'command':<20} {'coalescing':<11} {'ms/burst':>9} {'API calls':>10}")
+
+    scenarios = (
+        ("get_project_info", {}),
+        ("get_timeline_info", {"timeline_name": "Timeline 2"}),
+        ("get_project_snapshot", {}),
+    )
+    for command_type, params in scenarios:
+        for enabled in (False, True):
+            single_flight.COALESCE = enabled
+            elapsed, calls = 0.0, 0
+            for _ in range(args.rounds):
+                command_cache.invalidate()
+                before = fake_resolve.STATS.total()
+                elapsed += asyncio.run(burst(connection, args.clients, command_type, params))
+                calls += fake_resolve.STATS.total() - before
+            print(f"{command_type:<20} {'on' if enabled else 'off':<11} "
+                  f"{elapsed / args.rounds * 1000:>9.2f} {calls // args.rounds:>10}")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure startup, per-call command dispatch overhead and sys.path growth.
+
+Runs a cheap read-only command many times through
+DaVinciConnection.execute_command against the fake DaVinciResolveScript
+module, and compares it with the old per-call sys.path.insert + import.
+
+    python benchmarks/bench_dispatch.py --calls 100000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_resolve
+
+
+def legacy_execute(connection, command_type, params=None):
+    """Dispatch the way DaVinciConnection.execute_command used to"""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.davinci_resolve_mcp.commands import execute_command
+    return execute_command(connection, command_type, params)
+
+
+def measure(label, calls, func):
+    path_before = len(sys.path)
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / calls * 1e6:>8.2f} us/call  sys.path {path_before} -> {len(sys.path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Keep the per-call INFO log line out of the measurement
+    logging.disable(logging.INFO)
+
+    fake_resolve.install()
+    start = time.perf_counter()
+    from src.davinci_resolve_mcp.connection import DaVinciConnection
+
+    connection = DaVinciConnection()
+    connection.connect()
+    print(f"startup    {(time.perf_counter() - start) * 1000:>8.2f} ms (import + connect)")
+
+    print(f"{args.calls} calls of get_cache_stats")
+    saved_path = list(sys.path)
+    measure("legacy", args.calls, lambda: legacy_execute(connection, "get_cache_stats"))
+    sys.path[:] = saved_path
+    measure("current", args.calls, lambda: connection.execute_command("get_cache_stats"))
+
+
+if __name__ == "__main__":
+    main()
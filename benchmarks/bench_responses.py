@@ -0,0 +1,68 @@
+"""
+Measure tool response size and encoding time.
+
+Builds a list_timeline_items response for a timeline of the given size and
+encodes it the old way (json.dumps with indent=2), as compact JSON, and with
+orjson when it is installed. Also shows how many pages the response size
+budget splits it into.
+
+    python benchmarks/bench_responses.py --items 5000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_resolve
+
+
+def measure(label, runs, func):
+    start = time.perf_counter()
+    for _ in range(runs):
+        text = func()
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"{label:<14} {len(text):>10} chars  {elapsed * 1000:>8.3f} ms")
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fake_resolve.install(fake_resolve.make_resolve(timelines=1, clips=100, items=args.items))
+    from src.davinci_resolve_mcp import responses
+    from src.davinci_resolve_mcp.connection import DaVinciConnection
+
+    connection = DaVinciConnection()
+    connection.connect()
+    result = connection.execute_command("list_timeline_items", {"limit": min(args.items, 500)})
+
+    measure("indent=2", args.runs, lambda: json.dumps(result, indent=2))
+    responses.USE_ORJSON = False
+    measure("compact json", args.runs, lambda: responses.dumps(result))
+    if responses.orjson is not None:
+        responses.USE_ORJSON = True
+        measure("compact orjson", args.runs, lambda: responses.dumps(result))
+    else:
+        print("orjson          not installed")
+
+    # Page through a larger payload under a small budget
+    budget = 20_000
+    page = json.loads(responses.encode_response(result, budget))
+    pages = 1
+    while "continuation" in page:
+        page = json.loads(responses.encode_response(responses.next_page(page["continuation"]["token"]), budget))
+        pages += 1
+    print(f"{pages} pages of at most {budget} chars")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
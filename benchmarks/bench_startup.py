@@ -0,0 +1,64 @@
+"""
+Measure server cold start against a Resolve that is slow to answer.
+
+Installs the fake DaVinciResolveScript module with an artificial delay in
+scriptapp() and times importing the server, getting the shared connection,
+the first tool call and the moment the background connection completes.
+
+    python benchmarks/bench_startup.py --delay 2.0
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_resolve
+
+
+def elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=2.0, help="seconds scriptapp() blocks for")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fake_resolve.install(delay=args.delay)
+
+    start = time.perf_counter()
+    try:
+        from src.davinci_resolve_mcp import server  # noqa: F401
+        label = "import server"
+    except ImportError:
+        # The mcp package is not installed; time the connection layer alone
+        label = "import connection"
+    from src.davinci_resolve_mcp import connection as connection_module
+    print(f"{label:<24} {elapsed_ms(start):>9.2f} ms")
+
+    start = time.perf_counter()
+    connection = connection_module.get_davinci_connection()
+    print(f"{'get_davinci_connection':<24} {elapsed_ms(start):>9.2f} ms")
+
+    start = time.perf_counter()
+    result = connection.execute_command("get_project_info")
+    print(f"{'first tool call':<24} {elapsed_ms(start):>9.2f} ms  status={result.get('status')}")
+
+    start = time.perf_counter()
+    while not connection.resolve:
+        time.sleep(0.005)
+    print(f"{'connected after':<24} {elapsed_ms(start):>9.2f} ms")
+
+    start = time.perf_counter()
+    result = connection.execute_command("get_project_info")
+    print(f"{'next tool call':<24} {elapsed_ms(start):>9.2f} ms  project={result.get('name')}")
+
+    print(f"(the old import-time connect blocked for at least {args.delay * 1000:.0f} ms before any of this)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Count Resolve API round trips for timeline lookups by name.
+
+Compares the old linear GetTimelineByIndex scan with the connection's
+timeline index against a fake Resolve with many timelines.
+
+    python benchmarks/bench_timeline_lookup.py --timelines 300
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_resolve
+from benchmarks.fake_resolve import STATS
+
+
+def linear_find(project, name):
+    """The lookup get_timeline_info and create_timeline used to do"""
+    for i in range(1, project.GetTimelineCount() + 1):
+        timeline = project.GetTimelineByIndex(i)
+        if timeline and timeline.GetName() == name:
+            return timeline
+    return None
+
+
+def measure(label, lookups, func):
+    STATS.reset()
+    start = time.perf_counter()
+    for name in lookups:
+        func(name)
+    elapsed = time.perf_counter() - start
+    calls = STATS.total()
+    print(f"{label:<28} {calls:>9} calls  {calls / len(lookups):>8.1f} calls/lookup  {elapsed * 1000:>8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timelines", type=int, default=300)
+    parser.add_argument("--lookups", type=int, default=100)
+    args = parser.parse_args()
+
+    resolve = fake_resolve.install(fake_resolve.make_resolve(timelines=args.timelines))
+    from src.davinci_resolve_mcp.connection import DaVinciConnection
+    from src.davinci_resolve_mcp.commands import create_timeline, get_timeline_info
+
+    connection = DaVinciConnection()
+    connection.connect()
+    project = resolve.GetProjectManager().GetCurrentProject()
+
+    # Spread lookups across the project, always including the worst case
+    step = max(1, args.timelines // args.lookups)
+    lookups = [f"Timeline {i}" for i in range(args.timelines, 0, -step)][:args.lookups]
+    missing = [f"Missing {i}" for i in range(len(lookups))]
+
+    print(f"{args.timelines} timelines, {len(lookups)} lookups")
+    measure("linear scan (hit)", lookups, lambda name: linear_find(project, name))
+    measure("linear scan (miss)", missing, lambda name: linear_find(project, name))
+
+    connection.timeline_index.invalidate()
+    measure("index, first build + hits", lookups, connection.find_timeline)
+    measure("index (hit)", lookups, connection.find_timeline)
+    measure("index (miss)", missing, connection.find_timeline)
+
+    measure("get_timeline_info", lookups, lambda name: get_timeline_info(connection, name))
+    new_names = [f"New {i}" for i in range(len(lookups))]
+    measure("create_timeline", new_names, lambda name: create_timeline(connection, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+"""
+Pure-Python stand-in for the DaVinciResolveScript module.
+
+Models a project manager, projects, timelines with tracks and items, markers
+and a media pool with folders and clips. Every capitalised method on a fake
+object counts as one scripting API round trip. Calls are tallied in STATS and
+can be slowed down with STATS.latency to mimic the IPC cost of talking to a
+running Resolve.
+"""
+import functools
+import os
+import sys
+import time
+import types
+from collections import Counter
+
+
+class ApiStats:
+    """Counts fake Resolve API calls"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.latency = 0.0
+
+    def record(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            _wait(self.latency)
+
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls.clear()
+
+
+STATS = ApiStats()
+
+RENDER_PRESETS = ("YouTube - 1080p", "H.264 Master", "ProRes 422 HQ")
+RENDER_CODECS = {
+    "mp4": {"H.264": "H264", "H.265": "H265"},
+    "mov": {"H.264": "H264", "Apple ProRes 422 HQ": "ProRes422HQ"},
+}
+
+
+def _wait(seconds):
+    """Sleep, spinning for delays too short for time.sleep to honour"""
+    if seconds >= 0.002:
+        time.sleep(seconds)
+        return
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _api_method(owner, name, func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        STATS.record(f"{owner}.{name}")
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+class FakeObject:
+    """Base class that turns CamelCase methods into counted API calls"""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        owner = cls.__name__.removeprefix("Fake")
+        for name, value in list(vars(cls).items()):
+            if name[:1].isupper() and callable(value):
+                setattr(cls, name, _api_method(owner, name, value))
+
+
+class FakeMediaPoolItem(FakeObject):
+    _next_id = 0
+
+    def __init__(self, name, path="", frames=240):
+        FakeMediaPoolItem._next_id += 1
+        self.uid = f"clip-{FakeMediaPoolItem._next_id}"
+        self.name = name
+        self.frames = frames
+        self.properties = {"Clip Name": name, "File Path": path, "Frames": str(frames)}
+        self.metadata = {}
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetClipProperty(self, key=None):
+        if key is None:
+            return dict(self.properties)
+        return self.properties.get(key, "")
+
+    def GetMetadata(self, key=None):
+        if key is None:
+            return dict(self.metadata)
+        return self.metadata.get(key, "")
+
+    def SetMetadata(self, key, value):
+        self.metadata[key] = value
+        return True
+
+
+class FakeTimelineItem(FakeObject):
+    _next_id = 0
+
+    def __init__(self, name, start, end, media_pool_item=None):
+        FakeTimelineItem._next_id += 1
+        self.uid = f"item-{FakeTimelineItem._next_id}"
+        self.name = name
+        self.start = start
+        self.end = end
+        self.media_pool_item = media_pool_item
+        self.clip_color = ""
+        self.grade = {}
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetStart(self):
+        return self.start
+
+    def GetEnd(self):
+        return self.end
+
+    def GetDuration(self):
+        return self.end - self.start
+
+    def GetMediaPoolItem(self):
+        return self.media_pool_item
+
+    def GetClipColor(self):
+        return self.clip_color
+
+    def SetCDL(self, cdl):
+        if not {"NodeIndex", "Slope", "Offset", "Power", "Saturation"} <= set(cdl):
+            return False
+        self.grade["cdl"] = dict(cdl)
+        return True
+
+    def SetLUT(self, node_index, lut_path):
+        self.grade.setdefault("luts", {})[node_index] = lut_path
+        return True
+
+
+class FakeTimeline(FakeObject):
+    _next_id = 0
+
+    def __init__(self, name, duration=0):
+        FakeTimeline._next_id += 1
+        self.uid = f"timeline-{FakeTimeline._next_id}"
+        self.name = name
+        self.duration = duration
+        self.start_frame = 86400
+        self.tracks = {"video": [[]], "audio": [[]], "subtitle": []}
+        self.markers = {}
+
+    def GetName(self):
+        return self.name
+
+    def SetName(self, name):
+        self.name = name
+        return True
+
+    def GetDuration(self):
+        return self.duration
+
+    def GetTrackCount(self, track_type):
+        return len(self.tracks.get(track_type, []))
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetStartFrame(self):
+        return self.start_frame
+
+    def GetEndFrame(self):
+        return self.start_frame + self.duration
+
+    def GetMarkers(self):
+        return {frame: dict(marker) for frame, marker in self.markers.items()}
+
+    def AddMarker(self, frame, color, name, note, duration, custom_data=""):
+        if frame in self.markers:
+            return False
+        self.markers[frame] = {
+            "color": color, "name": name, "note": note, "duration": duration, "customData": custom_data
+        }
+        return True
+
+    def DeleteMarkerAtFrame(self, frame):
+        return self.markers.pop(frame, None) is not None
+
+    def ApplyGradeFromDRX(self, path, grade_mode, items):
+        for item in items:
+            item.grade["drx"] = (path, grade_mode)
+        return True
+
+    def AddTrack(self, track_type, sub_type=None):
+        if track_type not in self.tracks:
+            return False
+        self.tracks[track_type].append([])
+        return True
+
+    def GetItemListInTrack(self, track_type, index):
+        tracks = self.tracks.get(track_type, [])
+        if 1 <= index <= len(tracks):
+            return list(tracks[index - 1])
+        return None
+
+    def append_item(self, item, track_type="video", track_index=1):
+        """Test helper: place an item on a track, not part of the Resolve API"""
+        tracks = self.tracks.setdefault(track_type, [])
+        while len(tracks) < track_index:
+            tracks.append([])
+        tracks[track_index - 1].append(item)
+        self.duration = max(self.duration, item.end)
+        return item
+
+
+class FakeFolder(FakeObject):
+    _next_id = 0
+
+    def __init__(self, name):
+        FakeFolder._next_id += 1
+        self.uid = f"folder-{FakeFolder._next_id}"
+        self.name = name
+        self.clips = []
+        self.subfolders = []
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetClipList(self):
+        return list(self.clips)
+
+    def GetSubFolderList(self):
+        return list(self.subfolders)
+
+
+class FakeMediaPool(FakeObject):
+    def __init__(self, project):
+        self.project = project
+        self.root = FakeFolder("Master")
+        self.current_folder = self.root
+
+    def GetRootFolder(self):
+        return self.root
+
+    def GetCurrentFolder(self):
+        return self.current_folder
+
+    def SetCurrentFolder(self, folder):
+        self.current_folder = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        folder = FakeFolder(name)
+        parent.subfolders.append(folder)
+        return folder
+
+    def AppendToTimeline(self, clips):
+        timeline = self.project.current_timeline
+        if timeline is None:
+            return []
+        appended = []
+        for clip in clips:
+            info = clip if isinstance(clip, dict) else {"mediaPoolItem": clip}
+            media_pool_item = info["mediaPoolItem"]
+            start = info.get("startFrame", 0)
+            end = info.get("endFrame", media_pool_item.frames - 1)
+            track_type = "audio" if info.get("mediaType") == 2 else "video"
+            track_index = info.get("trackIndex", 1)
+            record = info.get("recordFrame")
+            if record is None:
+                track = timeline.tracks[track_type][track_index - 1] if track_index <= len(timeline.tracks[track_type]) else []
+                record = track[-1].end if track else 0
+            # endFrame is the last source frame used, not one past it
+            item = FakeTimelineItem(media_pool_item.name, record, record + end - start + 1, media_pool_item)
+            appended.append(timeline.append_item(item, track_type, track_index))
+        return appended
+
+    def ImportMedia(self, paths):
+        items = [FakeMediaPoolItem(os.path.basename(path), path) for path in paths]
+        self.current_folder.clips.extend(items)
+        return items
+
+    def CreateEmptyTimeline(self, name):
+        if any(timeline.name == name for timeline in self.project.timelines):
+            return None
+        timeline = FakeTimeline(name)
+        self.project.timelines.append(timeline)
+        self.project.current_timeline = timeline
+        return timeline
+
+
+class FakeProject(FakeObject):
+    _next_id = 0
+
+    def __init__(self, name="Untitled Project"):
+        FakeProject._next_id += 1
+        self.uid = f"project-{FakeProject._next_id}"
+        self.name = name
+        self.timelines = []
+        self.current_timeline = None
+        self.settings = {
+            "timelineFrameRate": "24",
+            "timelineResolutionWidth": "1920",
+            "timelineResolutionHeight": "1080",
+        }
+        self.media_pool = FakeMediaPool(self)
+        self.render_settings = {}
+        self.render_jobs = {}
+        self._next_job = 0
+        # Wall-clock seconds every simulated render job takes
+        self.render_seconds = 2.0
+
+    def GetName(self):
+        return self.name
+
+    def GetUniqueId(self):
+        return self.uid
+
+    def GetTimelineCount(self):
+        return len(self.timelines)
+
+    def GetTimelineByIndex(self, index):
+        if 1 <= index <= len(self.timelines):
+            return self.timelines[index - 1]
+        return None
+
+    def GetCurrentTimeline(self):
+        return self.current_timeline
+
+    def SetCurrentTimeline(self, timeline):
+        if timeline not in self.timelines:
+            return False
+        self.current_timeline = timeline
+        return True
+
+    def GetMediaPool(self):
+        return self.media_pool
+
+    def GetSetting(self, key=None):
+        if key is None:
+            return dict(self.settings)
+        return self.settings.get(key, "")
+
+    def SetSetting(self, key, value):
+        self.settings[key] = value
+        return True
+
+    def LoadRenderPreset(self, name):
+        return name in RENDER_PRESETS
+
+    def SetRenderSettings(self, settings):
+        self.render_settings.update(settings)
+        return True
+
+    def SetCurrentRenderFormatAndCodec(self, format, codec):
+        if codec not in RENDER_CODECS.get(format, {}).values():
+            return False
+        self.render_settings.update({"Format": format, "Codec": codec})
+        return True
+
+    def GetRenderCodecs(self, format):
+        return dict(RENDER_CODECS.get(format, {}))
+
+    def AddRenderJob(self):
+        if self.current_timeline is None:
+            return ""
+        self._next_job += 1
+        job_id = f"job-{self._next_job}"
+        self.render_jobs[job_id] = {
+            "timeline": self.current_timeline.name, "settings": dict(self.render_settings),
+            "started": None, "status": "Ready"
+        }
+        return job_id
+
+    def DeleteRenderJob(self, job_id):
+        return self.render_jobs.pop(job_id, None) is not None
+
+    def GetRenderJobList(self):
+        return [{"JobId": job_id, "TimelineName": job["timeline"], **job["settings"]} for job_id, job in self.render_jobs.items()]
+
+    def StartRendering(self, *job_ids, isInteractiveMode=False):
+        now = time.monotonic()
+        for job_id in job_ids or list(self.render_jobs):
+            if job_id in self.render_jobs:
+                self.render_jobs[job_id]["started"] = now
+        return True
+
+    def StopRendering(self):
+        for job in self.render_jobs.values():
+            if job["started"] is not None and self._progress(job) < 100:
+                job["status"] = "Cancelled"
+        return True
+
+    def IsRenderingInProgress(self):
+        return any(job["started"] is not None and job["status"] != "Cancelled" and self._progress(job) < 100
+                   for job in self.render_jobs.values())
+
+    def GetRenderJobStatus(self, job_id):
+        job = self.render_jobs.get(job_id)
+        if job is None:
+            return {}
+        if job["started"] is None or job["status"] == "Cancelled":
+            return {"JobStatus": job["status"], "CompletionPercentage": 0}
+        progress = self._progress(job)
+        if progress >= 100:
+            return {"JobStatus": "Complete", "CompletionPercentage": 100, "TimeTakenToRenderInMs": int(self.render_seconds * 1000)}
+        return {"JobStatus": "Rendering", "CompletionPercentage": progress,
+                "EstimatedTimeRemainingInMs": int((100 - progress) * self.render_seconds * 10)}
+
+    def _progress(self, job):
+        """Simulated render progress from the time since the job started"""
+        return min(100, int((time.monotonic() - job["started"]) / self.render_seconds * 100))
+
+
+class FakeProjectManager(FakeObject):
+    def __init__(self):
+        self.projects = {}
+        self.current_project = None
+
+    def GetCurrentProject(self):
+        return self.current_project
+
+    def CreateProject(self, name):
+        if name in self.projects:
+            return None
+        project = FakeProject(name)
+        self.projects[name] = project
+        self.current_project = project
+        return project
+
+    def LoadProject(self, name):
+        project = self.projects.get(name)
+        if project:
+            self.current_project = project
+        return project
+
+    def SaveProject(self):
+        return self.current_project is not None
+
+    def GetProjectListInCurrentFolder(self):
+        return list(self.projects)
+
+
+class FakeResolve(FakeObject):
+    def __init__(self):
+        self.project_manager = FakeProjectManager()
+        # Set to False to make the handle behave like a Resolve that has quit
+        self.running = True
+
+    def GetProjectManager(self):
+        return self.project_manager
+
+    def GetProductName(self):
+        return "DaVinci Resolve"
+
+    def GetVersionString(self):
+        return "18.6.0.0" if self.running else None
+
+
+def make_resolve(timelines=0, clips=0, folders=1, items=0, project_name="Benchmark Project"):
+    """Build a fake Resolve with one open project
+
+    timelines: number of timelines in the project
+    clips: media pool clips, spread evenly over `folders` bins under Master
+    items: clips cut one after another onto video track 1 of the first timeline
+    """
+    resolve = FakeResolve()
+    project = resolve.project_manager.CreateProject(project_name)
+    for i in range(timelines):
+        project.timelines.append(FakeTimeline(f"Timeline {i + 1}", duration=24 * 60))
+    if project.timelines:
+        project.current_timeline = project.timelines[0]
+
+    root = project.media_pool.root
+    bins = [root] if folders <= 1 else []
+    for i in range(len(bins), folders):
+        folder = FakeFolder(f"Bin {i + 1}")
+        root.subfolders.append(folder)
+        bins.append(folder)
+    media = []
+    for i in range(clips):
+        clip = FakeMediaPoolItem(f"Clip {i + 1:05d}.mov", f"/media/bin{i % len(bins) + 1}/Clip {i + 1:05d}.mov")
+        bins[i % len(bins)].clips.append(clip)
+        media.append(clip)
+
+    if items and project.current_timeline and media:
+        timeline = project.current_timeline
+        record = 0
+        for i in range(items):
+            clip = media[i % len(media)]
+            timeline.append_item(FakeTimelineItem(clip.name, record, record + clip.frames, clip))
+            record += clip.frames
+
+    STATS.reset()
+    return resolve
+
+
+def install(resolve=None, delay=0.0, hosts=None):
+    """Register a fake DaVinciResolveScript module and return its Resolve
+
+    delay makes scriptapp() block like a Resolve that is still starting up.
+    hosts maps host names to the fakes that scriptapp("Resolve", host) returns.
+    """
+    resolve = resolve or make_resolve()
+
+    def scriptapp(app, host=None):
+        if delay:
+            time.sleep(delay)
+        if app != "Resolve":
+            return None
+        return (hosts or {}).get(host) if host else resolve
+
+    module = types.ModuleType("DaVinciResolveScript")
+    module.scriptapp = scriptapp
+    sys.modules["DaVinciResolveScript"] = module
+    return resolve
@@ -0,0 +1,247 @@
+"""
+Drive every registered command against the simulated Resolve at several scales.
+
+For each scale a fresh fake project is built, then each command runs
+repeatedly through DaVinciConnection.execute_command. The report shows ops/s,
+Resolve API calls for the first (cold) run and per warm op, and p50
+latency. Results can be saved and compared against a baseline; more API
+calls per op than the baseline fails the run.
+
+    python benchmarks/run_benchmarks.py --scale small medium
+    python benchmarks/run_benchmarks.py --scale large --latency 0.0002
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the search index cache out of the user's cache directory
+os.environ.setdefault("DAVINCI_RESOLVE_MCP_CACHE_DIR", tempfile.mkdtemp(prefix="resolve-mcp-bench-"))
+
+from benchmarks import fake_resolve
+from benchmarks.fake_resolve import STATS
+
+if __name__ == "__mp_main__":
+    # Spawned script workers import this file as __mp_main__; give them a fake Resolve too
+    fake_resolve.install()
+
+SCALES = {
+    "small": {"clips": 10, "timelines": 10, "folders": 2, "items": 10},
+    "medium": {"clips": 1000, "timelines": 100, "folders": 10, "items": 1000},
+    "large": {"clips": 50000, "timelines": 500, "folders": 50, "items": 5000},
+}
+
+# API calls per op may grow this much over the baseline before the run fails
+REGRESSION_TOLERANCE = 0.10
+
+
+class Environment:
+    """What scenarios need to know about the fake project"""
+
+    def __init__(self, scale, media_dir):
+        self.clips = [f"Clip {i + 1:05d}.mov" for i in range(scale["clips"])]
+        self.timelines = [f"Timeline {i + 1}" for i in range(scale["timelines"])]
+        self.media_dir = media_dir
+        self.media_files = sorted(os.path.join(media_dir, name) for name in os.listdir(media_dir))
+
+    def clip(self, i):
+        return self.clips[i % len(self.clips)]
+
+    def timeline(self, i):
+        return self.timelines[i % len(self.timelines)]
+
+    def continuation_token(self):
+        from src.davinci_resolve_mcp import responses
+        page = json.loads(responses.encode_response({"items": self.clips * 10 or ["clip"] * 1000}, budget=1000))
+        return page["continuation"]["token"]
+
+
+# Params for the i-th run of each command; every registered command needs one
+SCENARIOS = {
+    "get_project_info": lambda env, i: {},
+    "get_project_snapshot": lambda env, i: {},
+    "get_changes_since": lambda env, i: {},
+    "get_timeline_info": lambda env, i: {"timeline_name": env.timeline(i)},
+    "list_timeline_items": lambda env, i: {"limit": 100, "fields": ["name", "start", "end", "media_path"]},
+    "get_media_pool_info": lambda env, i: {"limit": 100},
+    "get_cache_stats": lambda env, i: {},
+    "get_server_metrics": lambda env, i: {},
+    "dump_server_metrics": lambda env, i: {"dump_path": os.path.join(os.environ["DAVINCI_RESOLVE_MCP_CACHE_DIR"], "metrics.jsonl")},
+    "list_targets": lambda env, i: {},
+    "search_project": lambda env, i: {"query": "clip"},
+    "create_timeline": lambda env, i: {"name": f"Bench Timeline {i}"},
+    "set_current_timeline": lambda env, i: {"timeline_name": env.timeline(0)},
+    "add_clip_to_timeline": lambda env, i: {"clip_name": env.clip(i)},
+    "build_timeline_from_edl": lambda env, i: {
+        "entries": [{"clip": env.clip(n), "in": 0, "out": 48, "media_type": "video"} for n in range(1000)],
+        "timeline_name": f"Bench Cut {i}"
+    },
+    "delete_clip_from_timeline": lambda env, i: {"clip_name": env.clip(i)},
+    "add_transition": lambda env, i: {"clip_name": env.clip(i)},
+    "add_effect": lambda env, i: {"clip_name": env.clip(i), "effect_name": "Gaussian Blur"},
+    "color_grade_clip": lambda env, i: {"clip_name": env.clip(i), "saturation": 1.1},
+    "grade_clips": lambda env, i: {"select_all": True, "cdl": {"slope": [1.05, 1.0, 0.95], "saturation": 0.9}},
+    "import_media": lambda env, i: {"file_path": env.media_files[i % len(env.media_files)]},
+    "import_media_bulk": lambda env, i: {"paths": [env.media_dir]},
+    "export_timeline": lambda env, i: {"output_path": "/tmp/bench.mp4"},
+    "render_timelines": lambda env, i: {
+        "jobs": [{"timeline": env.timeline(i + n), "output_name": f"bench_{i}_{n}"} for n in range(5)],
+        "format": "mp4", "codec": "H264"
+    },
+    "get_render_status": lambda env, i: {},
+    "add_marker": lambda env, i: {"frame": i},
+    "add_markers_bulk": lambda env, i: {
+        "frames": list(range(1000)), "names": [f"Marker {n}" for n in range(1000)], "on_conflict": "replace"
+    },
+    "get_markers": lambda env, i: {},
+    "set_project_settings": lambda env, i: {"timeline_frame_rate": 24.0},
+    "execute_script": lambda env, i: {"code": "result = project.GetName()"},
+    "execute_script_isolated": lambda env, i: {"code": "result = 1"},
+    "list_script_sessions": lambda env, i: {},
+    "get_response_page": lambda env, i: {"token": env.continuation_token()},
+    "execute_batch": lambda env, i: {
+        "operations": [{"command": "get_timeline_info", "params": {"timeline_name": env.timeline(i + n)}} for n in range(20)],
+        "include_results": False
+    },
+}
+
+
+def _make_media_dir(count=20):
+    media_dir = tempfile.mkdtemp(prefix="davinci-bench-")
+    for i in range(count):
+        with open(os.path.join(media_dir, f"bench_{i:03d}.mov"), "wb") as handle:
+            handle.write(b"\0" * 1024)
+    return media_dir
+
+
+def run_command(connection, command_type, scenario, env, seconds, max_ops, use_cache):
+    from src.davinci_resolve_mcp.commands.cache import command_cache
+
+    timings, calls, errors = [], [], 0
+    deadline = time.perf_counter() + seconds
+    while len(timings) < max_ops and (not timings or time.perf_counter() < deadline):
+        params = scenario(env, len(timings))
+        if not use_cache:
+            command_cache.invalidate()
+        STATS.reset()
+        start = time.perf_counter()
+        try:
+            result = connection.execute_command(command_type, params)
+            # A script worker without a Resolve handle ran nothing worth timing
+            if isinstance(result, dict) and (result.get("status") == "error" or result.get("connected") is False):
+                errors += 1
+        except Exception:
+            errors += 1
+        timings.append(time.perf_counter() - start)
+        calls.append(STATS.total())
+
+    return {
+        "ops": len(timings),
+        "ops_per_second": round(len(timings) / sum(timings), 1) if sum(timings) else None,
+        "first_op_api_calls": calls[0],
+        # The first run pays for building indexes; report steady state separately
+        "api_calls_per_op": round(statistics.mean(calls[1:] or calls), 2),
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "errors": errors
+    }
+
+
+def run_scale(name, scale, args, media_dir):
+    from src.davinci_resolve_mcp import connection as connection_module
+    from src.davinci_resolve_mcp.commands.registry import COMMANDS
+
+    resolve = fake_resolve.make_resolve(**scale)
+    fake_resolve.install(resolve)
+    # The connection module keeps the first Resolve it sees; hand it this one
+    connection_module.RESOLVE_INSTANCE = resolve
+    connection = connection_module.DaVinciConnection()
+    connection.connect()
+    STATS.latency = args.latency
+    env = Environment(scale, media_dir)
+
+    missing = [command for command in COMMANDS if command not in SCENARIOS]
+    if missing:
+        print(f"  no scenario for: {', '.join(missing)}")
+
+    # Queries first, so they see the project as built rather than as edited
+    ordered = sorted(
+        (spec for spec in COMMANDS.values() if spec.name in SCENARIOS),
+        key=lambda spec: not spec.read_only
+    )
+    if args.commands:
+        ordered = [spec for spec in ordered if spec.name in args.commands]
+
+    results = {}
+    print(f"\n{name}: {scale}")
+    print(f"  {'command':<28} {'ops':>6} {'ops/s':>11} {'cold calls':>11} {'calls/op':>10} {'p50 ms':>9} {'errors':>6}")
+    for spec in ordered:
+        result = run_command(connection, spec.name, SCENARIOS[spec.name], env, args.seconds, args.max_ops, args.cache)
+        results[spec.name] = result
+        print(f"  {spec.name:<28} {result['ops']:>6} {result['ops_per_second'] or 0:>11.1f} "
+              f"{result['first_op_api_calls']:>11} {result['api_calls_per_op']:>10.2f} "
+              f"{result['p50_ms']:>9.3f} {result['errors']:>6}")
+
+    STATS.latency = 0.0
+    connection.close()
+    return results
+
+
+def compare(results, baseline):
+    """Return lines describing API call regressions against a baseline"""
+    regressions = []
+    for scale, commands in results.items():
+        for command_type, result in commands.items():
+            before = baseline.get(scale, {}).get(command_type)
+            if not before:
+                continue
+            limit = before["api_calls_per_op"] * (1 + REGRESSION_TOLERANCE)
+            if result["api_calls_per_op"] > limit:
+                regressions.append(
+                    f"{scale}/{command_type}: {before['api_calls_per_op']} -> {result['api_calls_per_op']} API calls per op"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", nargs="+", choices=SCALES, default=["small", "medium"])
+    parser.add_argument("--commands", nargs="+", help="only run these commands")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every fake API call")
+    parser.add_argument("--seconds", type=float, default=0.5, help="time budget per command")
+    parser.add_argument("--max-ops", type=int, default=200, help="maximum runs per command")
+    parser.add_argument("--cache", action="store_true", help="let queries hit the result cache")
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="fail if API calls per op grew over this saved baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    fake_resolve.install()
+    media_dir = _make_media_dir()
+
+    results = {name: run_scale(name, SCALES[name], args, media_dir) for name in args.scale}
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle))
+        if regressions:
+            print("\nAPI call regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo API call regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Change feed over the timelines of the open project.
+
+The feed keeps a fingerprint of every timeline: duration, track counts and the
+name, start and end of each item. The executor marks timelines as touched
+whenever a mutating command runs; the next read re-fingerprints only those,
+appends what differs to a change log under a new version, and answers
+"what changed since version X" from the log instead of from a full rescan.
+"""
+import logging
+import threading
+import uuid
+from collections import Counter, deque
+
+from .commands.timeline_info import TRACK_TYPES
+
+# Configure logging
+logger = logging.getLogger("DaVinciChangeFeed")
+
+# Versions kept in the change log; older ones get a resync instead of deltas
+MAX_LOG_ENTRIES = 1000
+
+# Commands that can edit any timeline, not just the one they name or the current one
+BROAD_COMMANDS = ("execute_script", "execute_script_isolated")
+
+# Commands that are not read-only but edit no timeline themselves: timeline
+# switches, metrics dumps, and batches whose operations are marked one by one
+NON_EDITING_COMMANDS = ("set_current_timeline", "dump_server_metrics", "execute_batch")
+
+# Marker for "whichever timeline is current when the feed or search index next refreshes"
+CURRENT_TIMELINE = object()
+
+
+def _header(timeline):
+    """Cheap summary of a timeline: duration and track counts"""
+    return (timeline.GetDuration(),) + tuple(timeline.GetTrackCount(track_type) or 0 for track_type in TRACK_TYPES)
+
+
+def _fingerprint(timeline):
+    """Duration, track counts and (name, start, end) of every item on a timeline"""
+    tracks = {}
+    for track_type in TRACK_TYPES:
+        tracks[track_type] = [
+            [(item.GetName(), item.GetStart(), item.GetEnd()) for item in timeline.GetItemListInTrack(track_type, index) or []]
+            for index in range(1, (timeline.GetTrackCount(track_type) or 0) + 1)
+        ]
+    return {"duration": timeline.GetDuration(), "tracks": tracks}
+
+
+def _fingerprint_header(fingerprint):
+    return (fingerprint["duration"],) + tuple(len(fingerprint["tracks"][track_type]) for track_type in TRACK_TYPES)
+
+
+def _summary(fingerprint):
+    return {
+        "duration": fingerprint["duration"],
+        "tracks": {track_type: len(tracks) for track_type, tracks in fingerprint["tracks"].items()},
+        "items": sum(len(track) for tracks in fingerprint["tracks"].values() for track in tracks)
+    }
+
+
+def _items(entries):
+    return [{"name": name, "start": start, "end": end} for name, start, end in entries]
+
+
+def _diff_timeline(name, old, new):
+    """Describe how a timeline changed between two fingerprints, or None if it did not"""
+    change = {"timeline": name}
+    if old["duration"] != new["duration"]:
+        change["duration"] = {"from": old["duration"], "to": new["duration"]}
+    tracks = []
+    for track_type in TRACK_TYPES:
+        old_tracks, new_tracks = old["tracks"][track_type], new["tracks"][track_type]
+        if len(old_tracks) != len(new_tracks):
+            change.setdefault("track_count", {})[track_type] = {"from": len(old_tracks), "to": len(new_tracks)}
+        for index in range(max(len(old_tracks), len(new_tracks))):
+            before = Counter(old_tracks[index]) if index < len(old_tracks) else Counter()
+            after = Counter(new_tracks[index]) if index < len(new_tracks) else Counter()
+            added, removed = after - before, before - after
+            if added or removed:
+                tracks.append({
+                    "track_type": track_type,
+                    "track": index + 1,
+                    "added": _items(sorted(added.elements(), key=lambda entry: entry[1])),
+                    "removed": _items(sorted(removed.elements(), key=lambda entry: entry[1]))
+                })
+    if tracks:
+        change["tracks"] = tracks
+    return change if len(change) > 1 else None
+
+
+class ChangeFeed:
+    """Versioned log of timeline changes for one project"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget the fingerprints; the next read starts a new version history"""
+        with self._lock:
+            self._project = None
+            self._fingerprints = None
+            self._epoch = uuid.uuid4().hex[:8]
+            self._serial = 0
+            self._log = deque(maxlen=MAX_LOG_ENTRIES)
+            self._dirty = set()
+            self._dirty_all = False
+            self._commands = []
+
+    @property
+    def version(self) -> str:
+        return f"{self._epoch}.{self._serial}"
+
+    def mark(self, command_type, params=None, finished=False):
+        """Note that a mutating command is running or has finished; costs no Resolve calls
+
+        Commands are marked both before and after they run, so a refresh that
+        happens while one is still editing does not take its final state as seen.
+        """
+        with self._lock:
+            if self._fingerprints is None or command_type in NON_EDITING_COMMANDS:
+                return
+            if not (finished and command_type in self._commands):
+                self._commands.append(command_type)
+            if command_type in BROAD_COMMANDS:
+                self._dirty_all = True
+            timeline_name = (params or {}).get("timeline_name")
+            self._dirty.add(timeline_name or CURRENT_TIMELINE)
+
+    def _baseline(self, connection):
+        self._project = connection.project
+        self._fingerprints = {}
+        for name in connection.timeline_names():
+            timeline = connection.find_timeline(name)
+            if timeline:
+                self._fingerprints[name] = _fingerprint(timeline)
+        logger.debug(f"Fingerprinted {len(self._fingerprints)} timelines")
+
+    def refresh(self, connection, full_scan=False):
+        """Re-fingerprint touched timelines and log any differences under a new version"""
+        with self._lock:
+            if self._fingerprints is None or self._project != connection.project:
+                if self._fingerprints is not None:
+                    self.reset()
+                self._baseline(connection)
+                return
+            if not (self._dirty or self._dirty_all or full_scan):
+                return
+
+            names = connection.timeline_names()
+            current = connection.project.GetCurrentTimeline() if CURRENT_TIMELINE in self._dirty else None
+            targets = {name for name in self._dirty if name is not CURRENT_TIMELINE}
+            if current:
+                targets.add(current.GetName())
+
+            changes = []
+            for name in [name for name in self._fingerprints if name not in names]:
+                del self._fingerprints[name]
+                changes.append({"timeline": name, "removed": True})
+
+            for name in names:
+                timeline = connection.find_timeline(name)
+                if not timeline:
+                    continue
+                old = self._fingerprints.get(name)
+                if old is None:
+                    new = self._fingerprints[name] = _fingerprint(timeline)
+                    changes.append({"timeline": name, "added": True, **_summary(new)})
+                    continue
+                if name not in targets and not full_scan:
+                    # Broad commands may have edited anything; the header decides whether to look closer
+                    if not self._dirty_all or _header(timeline) == _fingerprint_header(old):
+                        continue
+                new = _fingerprint(timeline)
+                change = _diff_timeline(name, old, new)
+                self._fingerprints[name] = new
+                if change:
+                    changes.append(change)
+
+            if changes:
+                self._serial += 1
+                self._log.append({"version": self.version, "serial": self._serial, "commands": self._commands, "changes": changes})
+            self._dirty = set()
+            self._dirty_all = False
+            self._commands = []
+
+    def changes_since(self, connection, version=None, full_scan=False):
+        """Return the changes logged after version, or a summary to resync from"""
+        with self._lock:
+            self.refresh(connection, full_scan)
+            current = self.version
+
+            if version == current:
+                return {"version": current, "unchanged": True}
+
+            serial = None
+            if version:
+                epoch, _, number = version.partition(".")
+                if epoch == self._epoch and number.isdigit() and int(number) <= self._serial:
+                    serial = int(number)
+            oldest = self._log[0]["serial"] if self._log else self._serial + 1
+
+            if serial is None or serial < oldest - 1:
+                result = {
+                    "version": current,
+                    "timelines": {name: _summary(fingerprint) for name, fingerprint in self._fingerprints.items()}
+                }
+                if version:
+                    result["resync"] = True
+                    result["message"] = "Version is unknown or too old; start again from this state"
+                return result
+
+            entries = [entry for entry in self._log if entry["serial"] > serial]
+            return {
+                "version": current,
+                "since_version": version,
+                "changes": [
+                    {"version": entry["version"], "commands": entry["commands"], "changes": entry["changes"]}
+                    for entry in entries
+                ]
+            }
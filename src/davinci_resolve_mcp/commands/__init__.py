@@ -6,17 +6,30 @@ This package contains modular commands for operating with DaVinci Resolve via th
 
 # Use relative imports to avoid circular dependencies
 from .project_info import get_project_info
-from .timeline_info import get_timeline_info
+from .project_snapshot import get_project_snapshot
+from .timeline_changes import get_changes_since
+from .timeline_info import get_timeline_info, set_current_timeline, list_timeline_items
 from .media_pool_info import get_media_pool_info
 from .create_timeline import create_timeline
 from .add_clip import add_clip_to_timeline
+from .build_timeline import build_timeline_from_edl
 from .delete_clip import delete_clip_from_timeline
 from .add_transition import add_transition
 from .add_effect import add_effect
 from .color_grade import color_grade_clip
-from .import_media import import_media
+from .import_media import import_media, import_media_bulk
 from .export_timeline import export_timeline
-from .add_marker import add_marker
+from .add_marker import add_marker, add_markers_bulk, get_markers
 from .project_settings import set_project_settings
-from .execute_script import execute_script
-from .command_executor import execute_command 
\ No newline at end of file
+from .execute_script import execute_script, execute_script_isolated, list_script_sessions
+from .cache import get_cache_stats
+from .batch import execute_batch
+from .server_metrics import get_server_metrics, dump_server_metrics
+from .response_pages import get_response_page
+from .search_project import search_project
+from .targets import list_targets
+from .registry import COMMANDS, Param, command
+from .command_executor import (
+    execute_command, bind_command, peek_command, command_timeout, command_runs_on_resolve_thread,
+    command_is_read_only, coalesce_key
+) 
\ No newline at end of file
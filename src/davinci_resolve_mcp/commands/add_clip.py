@@ -1,9 +1,40 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("add_clip_to_timeline", params=(
+    Param("clip_name", str, description="The name of the media pool clip to add"),
+    Param("track_number", int, 1, "The video track to add the clip to (default: 1)"),
+    Param("start_frame", int, 0, "The first frame of the clip to use (default: 0)"),
+    Param("end_frame", int, None, "The last frame of the clip to use (optional, defaults to the end of the clip)")
+))
 def add_clip_to_timeline(connection, clip_name, track_number=1, start_frame=0, end_frame=None):
     """Add a clip to the timeline"""
-    # Implement clip addition
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+    try:
+        project = connection.project
+        if not project.GetCurrentTimeline():
+            return {"status": "error", "message": "No timeline is currently active"}
+        
+        clip = connection.find_clip(name=clip_name)
+        if not clip:
+            return {"status": "error", "message": f"Clip not found in media pool: {clip_name}"}
+        
+        clip_info = {"mediaPoolItem": clip, "startFrame": start_frame, "trackIndex": track_number}
+        if end_frame is not None:
+            clip_info["endFrame"] = end_frame
+        
+        items = project.GetMediaPool().AppendToTimeline([clip_info])
+        if not items:
+            return {"status": "error", "message": f"Failed to add clip to timeline: {clip_name}"}
+        
+        return {
+            "status": "success",
+            "message": f"Added '{clip_name}' to track {track_number}",
+            "item": {"name": items[0].GetName(), "start": items[0].GetStart(), "end": items[0].GetEnd()}
+        }
+    except Exception as e:
+        logger.error(f"Error adding clip to timeline: {str(e)}")
+        return {"status": "error", "message": f"Error adding clip to timeline: {str(e)}"}
@@ -1,8 +1,16 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("add_effect", params=(
+    Param("clip_name", str, description="The name of the timeline clip to add the effect to"),
+    Param("effect_name", str, description="The name of the effect to add"),
+    Param("track_number", int, None, "The track to search (optional, searches all tracks if not specified)"),
+    Param("parameters", dict, None, "Effect parameter values by name (optional)")
+))
 def add_effect(connection, clip_name, effect_name, track_number=None, parameters=None):
     """Add an effect to a clip in the timeline"""
     # Implement effect addition
@@ -1,9 +1,267 @@
+import csv
+import io
 import logging
+import os
+import re
+import time
+
+from .registry import command, Param
+from .timeline_info import get_timeline, timeline_frame_rate, timecode_to_frames, frames_to_timecode
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+MARKER_COLORS = (
+    "Blue", "Cyan", "Green", "Yellow", "Red", "Pink", "Purple", "Fuchsia",
+    "Rose", "Lavender", "Sky", "Mint", "Lemon", "Sand", "Cocoa", "Cream"
+)
+MARKER_COLUMNS = ("frames", "durations", "colors", "names", "notes")
+ON_CONFLICT_MODES = ("skip", "replace", "error")
+MARKER_FORMATS = ("columns", "csv", "edl")
+
+# Marker events in an EDL exported from Resolve: record in is the third timecode
+_EDL_EVENT = re.compile(r"^\d+\s+\S+\s+\S+\s+\S+\s+(?:\d+\s+)?[\d:;]+\s+[\d:;]+\s+([\d:;]+)\s+[\d:;]+")
+_EDL_MARKER = re.compile(r"\|C:ResolveColor(\w+)|\|M:(.*?)\s*(?=\||$)|\|D:(\d+)")
+
+
+def _color(value):
+    """Canonical marker color name, accepting any case"""
+    for color in MARKER_COLORS:
+        if color.lower() == str(value).lower():
+            return color
+    raise Exception(f"Unknown marker color '{value}'; use one of: {', '.join(MARKER_COLORS)}")
+
+
+def _parse_csv(text):
+    """Columns from CSV text with a header row: frame plus optional duration, color, name, note"""
+    columns = {column: [] for column in MARKER_COLUMNS}
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "frame" not in [name.strip().lower() for name in reader.fieldnames]:
+        raise Exception("CSV markers need a header row with at least a 'frame' column")
+    for line, row in enumerate(reader, start=2):
+        row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+        try:
+            columns["frames"].append(int(row["frame"]))
+            columns["durations"].append(int(row.get("duration") or 1))
+        except ValueError:
+            raise Exception(f"CSV line {line}: frame and duration must be whole numbers")
+        columns["colors"].append(row.get("color") or None)
+        columns["names"].append(row.get("name", ""))
+        columns["notes"].append(row.get("note", ""))
+    return columns
+
+
+def _parse_edl(text, fps, start_frame):
+    """Columns from a marker EDL as exported by Resolve"""
+    columns = {column: [] for column in MARKER_COLUMNS}
+    for line in text.splitlines():
+        event = _EDL_EVENT.match(line.strip())
+        if event:
+            columns["frames"].append(timecode_to_frames(event.group(1), fps) - start_frame)
+            columns["durations"].append(1)
+            columns["colors"].append(None)
+            columns["names"].append("")
+            columns["notes"].append("")
+        elif line.lstrip().startswith("|") and columns["frames"]:
+            for color, name, duration in _EDL_MARKER.findall(line):
+                if color:
+                    columns["colors"][-1] = color
+                if name:
+                    columns["names"][-1] = name
+                if duration:
+                    columns["durations"][-1] = int(duration)
+    if not columns["frames"]:
+        raise Exception("No marker events found in the EDL")
+    return columns
+
+
+def _rows(columns, default_color):
+    """Validate columnar input and turn it into (frame, color, name, note, duration) rows"""
+    frames = columns.get("frames") or []
+    for column in MARKER_COLUMNS[1:]:
+        values = columns.get(column)
+        if values is not None and len(values) != len(frames):
+            raise Exception(f"'{column}' has {len(values)} entries but 'frames' has {len(frames)}")
+
+    durations = columns.get("durations") or [1] * len(frames)
+    colors = columns.get("colors") or [None] * len(frames)
+    names = columns.get("names") or [""] * len(frames)
+    notes = columns.get("notes") or [""] * len(frames)
+    rows = []
+    for index, frame in enumerate(frames):
+        if not isinstance(frame, int) or frame < 0:
+            raise Exception(f"Marker {index}: frame must be a whole number of at least 0, got {frame!r}")
+        if not isinstance(durations[index], int) or durations[index] < 1:
+            raise Exception(f"Marker {index}: duration must be a whole number of at least 1, got {durations[index]!r}")
+        try:
+            color = _color(colors[index] or default_color)
+        except Exception as e:
+            raise Exception(f"Marker {index}: {str(e)}")
+        rows.append((frame, color, str(names[index] or ""), str(notes[index] or ""), durations[index]))
+    return rows
+
+
+def add_markers(timeline, rows, on_conflict="skip"):
+    """Add marker rows after deduplicating them against each other and the timeline in one pass"""
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise Exception(f"on_conflict must be one of: {', '.join(ON_CONFLICT_MODES)}")
+
+    duration = timeline.GetDuration() or 0
+    if duration:
+        beyond = [frame for frame, *_ in rows if frame >= duration]
+        if beyond:
+            raise Exception(f"{len(beyond)} marker(s) are past the end of the timeline (frame {duration}), first at frame {beyond[0]}")
+
+    # Later rows win when the input repeats a frame
+    unique = {}
+    for row in rows:
+        unique[row[0]] = row
+    existing = set(timeline.GetMarkers() or {})
+    conflicts = sorted(frame for frame in unique if frame in existing)
+    if conflicts and on_conflict == "error":
+        raise Exception(f"{len(conflicts)} marker(s) already exist, first at frame {conflicts[0]}")
+
+    start = time.perf_counter()
+    added, replaced, failed = 0, 0, []
+    for frame in sorted(unique):
+        if frame in existing:
+            if on_conflict == "skip":
+                continue
+            timeline.DeleteMarkerAtFrame(frame)
+            replaced += 1
+        if timeline.AddMarker(*unique[frame]):
+            added += 1
+        else:
+            failed.append(frame)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "status": "success" if not failed else "error",
+        "message": f"Added {added} marker(s)",
+        "added": added,
+        "replaced": replaced,
+        "skipped_existing": len(conflicts) if on_conflict == "skip" else 0,
+        "duplicates_in_input": len(rows) - len(unique),
+        "ms": round(elapsed * 1000, 2),
+        "markers_per_second": round(added / elapsed, 1) if added and elapsed else None
+    }
+    if failed:
+        result["failed_frames"] = failed
+    return result
+
+
+@command("add_marker", params=(
+    Param("frame", int, description="The timeline frame to add the marker at"),
+    Param("color", str, "blue", "The marker color (default: blue)"),
+    Param("name", str, "", "The marker name (optional)"),
+    Param("note", str, "", "The marker note (optional)"),
+    Param("duration", int, 1, "The marker duration in frames (default: 1)")
+))
 def add_marker(connection, frame, color="blue", name="", note="", duration=1):
     """Add a marker to the timeline at the specified frame"""
-    # Implement marker addition
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+    timeline = get_timeline(connection)
+    rows = _rows({"frames": [frame], "durations": [duration], "colors": [color], "names": [name], "notes": [note]}, color)
+    result = add_markers(timeline, rows, on_conflict="error")
+    if result["added"]:
+        result["message"] = f"Added marker at frame {frame}"
+    return result
+
+
+@command("add_markers_bulk", timeout=300.0, params=(
+    Param("frames", list[int], None, "Marker frames, relative to the start of the timeline"),
+    Param("durations", list[int], None, "Duration of each marker in frames (optional, default 1)"),
+    Param("colors", list[str], None, "Color of each marker (optional, default: color)"),
+    Param("names", list[str], None, "Name of each marker (optional)"),
+    Param("notes", list[str], None, "Note of each marker (optional)"),
+    Param("csv", str, None, "Markers as CSV text with a header row: frame, duration, color, name, note (instead of the columns)"),
+    Param("edl", str, None, "Markers as an EDL exported from Resolve (instead of the columns)"),
+    Param("file_path", str, None, "A .csv or .edl file to read markers from (instead of the columns)"),
+    Param("color", str, "Blue", "The color for markers that do not give one (default: Blue)"),
+    Param("on_conflict", str, "skip", "What to do with markers on frames that already have one: skip, replace or error (default: skip)"),
+    Param("timeline_name", str, None, "The timeline to add markers to (optional, uses current timeline if not specified)")
+))
+def add_markers_bulk(connection, frames=None, durations=None, colors=None, names=None, notes=None, csv=None, edl=None,
+                     file_path=None, color="Blue", on_conflict="skip", timeline_name=None):
+    """Add many markers in one call from columns, CSV or EDL, skipping frames that already have a marker"""
+    sources = [source for source in (frames, csv, edl, file_path) if source is not None]
+    if len(sources) != 1:
+        raise Exception("Give markers as exactly one of: frames (with optional columns), csv, edl or file_path")
+
+    timeline = get_timeline(connection, timeline_name)
+    if file_path:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in (".csv", ".edl"):
+            raise Exception("file_path must be a .csv or .edl file")
+        try:
+            with open(os.path.expanduser(file_path), encoding="utf-8-sig") as handle:
+                text = handle.read()
+        except OSError as e:
+            raise Exception(f"Could not read {file_path}: {str(e)}")
+        csv, edl = (text, None) if extension == ".csv" else (None, text)
+
+    if csv is not None:
+        columns = _parse_csv(csv)
+    elif edl is not None:
+        columns = _parse_edl(edl, timeline_frame_rate(connection.project), timeline.GetStartFrame() or 0)
+    else:
+        columns = {"frames": frames, "durations": durations, "colors": colors, "names": names, "notes": notes}
+
+    return add_markers(timeline, _rows(columns, color), on_conflict)
+
+
+def _csv(columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["frame", "duration", "color", "name", "note"])
+    writer.writerows(zip(*(columns[column] for column in MARKER_COLUMNS)))
+    return buffer.getvalue()
+
+
+def _edl(timeline_name, markers, fps, start_frame):
+    lines = [f"TITLE: {timeline_name}", "FCM: NON-DROP FRAME", ""]
+    for event, (frame, marker) in enumerate(markers, start=1):
+        record_in = frames_to_timecode(start_frame + frame, fps)
+        record_out = frames_to_timecode(start_frame + frame + 1, fps)
+        lines.append(f"{event:03d}  001      V     C        {record_in} {record_out} {record_in} {record_out}  ")
+        lines.append(f" |C:ResolveColor{marker.get('color', 'Blue')} |M:{marker.get('name', '')} |D:{marker.get('duration', 1)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+@command("get_markers", read_only=True, params=(
+    Param("timeline_name", str, None, "The timeline to read markers from (optional, uses current timeline if not specified)"),
+    Param("format", str, "columns", "Output format: columns, csv or edl (default: columns)"),
+    Param("color", str, None, "Only return markers of this color (optional)"),
+    Param("start_frame", int, None, "Only return markers at or after this frame (optional)"),
+    Param("end_frame", int, None, "Only return markers before this frame (optional)")
+))
+def get_markers(connection, timeline_name=None, format="columns", color=None, start_frame=None, end_frame=None):
+    """Get a timeline's markers as columnar arrays, CSV or EDL in one call"""
+    if format not in MARKER_FORMATS:
+        raise Exception(f"format must be one of: {', '.join(MARKER_FORMATS)}")
+    color = _color(color) if color else None
+
+    timeline = get_timeline(connection, timeline_name)
+    markers = sorted(
+        (frame, marker) for frame, marker in (timeline.GetMarkers() or {}).items()
+        if (color is None or marker.get("color") == color)
+        and (start_frame is None or frame >= start_frame)
+        and (end_frame is None or frame < end_frame)
+    )
+    name = timeline.GetName()
+
+    if format == "edl":
+        text = _edl(name, markers, timeline_frame_rate(connection.project), timeline.GetStartFrame() or 0)
+        return {"timeline": name, "count": len(markers), "format": "edl", "edl": text}
+
+    columns = {
+        "frames": [frame for frame, _ in markers],
+        "durations": [marker.get("duration", 1) for _, marker in markers],
+        "colors": [marker.get("color", "") for _, marker in markers],
+        "names": [marker.get("name", "") for _, marker in markers],
+        "notes": [marker.get("note", "") for _, marker in markers]
+    }
+    if format == "csv":
+        return {"timeline": name, "count": len(markers), "format": "csv", "csv": _csv(columns)}
+
+    return {"timeline": name, "count": len(markers), **columns}
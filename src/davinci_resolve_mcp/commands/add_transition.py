@@ -1,8 +1,17 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("add_transition", params=(
+    Param("clip_name", str, description="The name of the timeline clip to add the transition to"),
+    Param("transition_type", str, "CROSS_DISSOLVE", "The transition to add (default: CROSS_DISSOLVE)"),
+    Param("duration", float, 1.0, "The transition duration in seconds (default: 1.0)"),
+    Param("position", str, "END", "Where to place the transition: START or END (default: END)"),
+    Param("track_number", int, None, "The track to search (optional, searches all tracks if not specified)")
+))
 def add_transition(connection, clip_name, transition_type="CROSS_DISSOLVE", duration=1.0, position="END", track_number=None):
     """Add a transition to a clip in the timeline"""
     # Implement transition addition
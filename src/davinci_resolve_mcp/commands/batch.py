@@ -0,0 +1,152 @@
+import logging
+import time
+
+from .registry import command, get_command, Param
+from .cache import command_cache
+from ..metrics import metrics
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+MAX_BATCH_SIZE = 1000
+ON_ERROR_MODES = ("stop", "continue")
+
+class _BatchMediaPool:
+    """Media pool wrapper that notices when a new timeline becomes current"""
+
+    def __init__(self, media_pool, project):
+        self._media_pool = media_pool
+        self._project = project
+
+    def __getattr__(self, name):
+        return getattr(self._media_pool, name)
+
+    def CreateEmptyTimeline(self, *args):
+        self._project.forget_timeline()
+        return self._media_pool.CreateEmptyTimeline(*args)
+
+    def CreateTimelineFromClips(self, *args):
+        self._project.forget_timeline()
+        return self._media_pool.CreateTimelineFromClips(*args)
+
+    def ImportTimelineFromFile(self, *args):
+        self._project.forget_timeline()
+        return self._media_pool.ImportTimelineFromFile(*args)
+
+class _BatchProject:
+    """Project wrapper that answers repeated lookups from memory during a batch"""
+
+    def __init__(self, project):
+        self._project = project
+        self._memo = {}
+
+    def __getattr__(self, name):
+        return getattr(self._project, name)
+
+    def __eq__(self, other):
+        return self._project == getattr(other, "_project", other)
+
+    def __hash__(self):
+        return hash(self._project)
+
+    def _remember(self, key, fetch):
+        if key not in self._memo:
+            self._memo[key] = fetch()
+        return self._memo[key]
+
+    def GetMediaPool(self):
+        return self._remember("media_pool", lambda: _BatchMediaPool(self._project.GetMediaPool(), self))
+
+    def GetCurrentTimeline(self):
+        return self._remember("current_timeline", self._project.GetCurrentTimeline)
+
+    def SetCurrentTimeline(self, timeline):
+        self._memo.pop("current_timeline", None)
+        return self._project.SetCurrentTimeline(timeline)
+
+    def forget_timeline(self):
+        """Drop the remembered current timeline"""
+        self._memo.pop("current_timeline", None)
+
+class _BatchConnection:
+    """Connection seen by the commands of one batch"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.project = _BatchProject(connection.project)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+def _failed(result):
+    return isinstance(result, dict) and result.get("status") == "error"
+
+@command("execute_batch", timeout=600.0, params=(
+    Param("operations", list[dict], description="Ordered list of {\"command\": name, \"params\": {...}} entries to run"),
+    Param("on_error", str, "stop", "What to do when an operation fails: stop or continue (default: stop)"),
+    Param("include_results", bool, True, "Return each operation's full result, not just its status (default: True)")
+))
+def execute_batch(connection, operations, on_error="stop", include_results=True):
+    """Run many commands in order in a single call"""
+    if on_error not in ON_ERROR_MODES:
+        raise Exception(f"on_error must be one of: {', '.join(ON_ERROR_MODES)}")
+    if len(operations) > MAX_BATCH_SIZE:
+        raise Exception(f"A batch can hold at most {MAX_BATCH_SIZE} operations")
+
+    # Validate everything up front so a typo does not leave a half-run batch
+    plan = []
+    for index, operation in enumerate(operations):
+        name = operation.get("command")
+        if name == "execute_batch":
+            raise Exception(f"Operation {index}: batches cannot be nested")
+        try:
+            spec = get_command(name)
+            plan.append((spec, spec.bind(operation.get("params"))))
+        except Exception as e:
+            raise Exception(f"Operation {index} ({name}): {str(e)}")
+
+    batch_connection = _BatchConnection(connection)
+    results = []
+    failures = 0
+    batch_start = time.perf_counter()
+
+    for index, (spec, kwargs) in enumerate(plan):
+        start = time.perf_counter()
+        entry = {"index": index, "command": spec.name}
+        try:
+            if not spec.read_only:
+                connection.record_change(spec.name, kwargs)
+            with metrics.track(spec.name):
+                result = spec.handler(batch_connection, **kwargs)
+            entry["ok"] = not _failed(result)
+            if not entry["ok"]:
+                entry["error"] = result.get("message")
+            if include_results or not entry["ok"]:
+                entry["result"] = result
+        except Exception as e:
+            logger.error(f"Batch operation {index} ({spec.name}) failed: {str(e)}")
+            entry["ok"] = False
+            entry["error"] = str(e)
+        finally:
+            if not spec.read_only:
+                command_cache.invalidate(connection)
+                connection.record_change(spec.name, kwargs, finished=True)
+            if spec.name in ("execute_script", "execute_script_isolated"):
+                # Arbitrary code may have switched timelines behind the wrappers
+                batch_connection.project.forget_timeline()
+        entry["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        results.append(entry)
+
+        if not entry["ok"]:
+            failures += 1
+            if on_error == "stop":
+                break
+
+    return {
+        "status": "success" if not failures else "error",
+        "completed": len(results),
+        "total": len(plan),
+        "failed": failures,
+        "ms": round((time.perf_counter() - batch_start) * 1000, 2),
+        "results": results
+    }
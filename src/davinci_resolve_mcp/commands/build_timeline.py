@@ -0,0 +1,289 @@
+import json
+import logging
+import os
+import re
+import time
+from urllib.parse import unquote, urlparse
+
+from .registry import command, Param
+from .timeline_info import get_timeline, timeline_frame_rate, timecode_to_frames
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+# AppendToTimeline mediaType values
+MEDIA_TYPES = {"video": 1, "audio": 2}
+EVENT_FILE_TYPES = (".edl", ".otio", ".json")
+
+_TIMECODE = r"\d{2}[:;]\d{2}[:;]\d{2}[:;]\d{2}"
+_EDL_EVENT = re.compile(
+    rf"^(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(?:\d+\s+)?({_TIMECODE})\s+({_TIMECODE})\s+({_TIMECODE})\s+({_TIMECODE})"
+)
+_EDL_TRACK = re.compile(r"^(V|A)(\d*)$")
+_BLACK_REELS = ("BL", "BLK", "BLACK")
+
+
+def _event(clip, source_in, source_out, track_type, track, record, source_timecode=False):
+    return {
+        "clip": clip,
+        "in": source_in,
+        "out": source_out,
+        "track_type": track_type,
+        "track": track,
+        "record": record,
+        "source_timecode": source_timecode
+    }
+
+
+def _edl_track(field):
+    """(track type, index) for an EDL track field; B or AA/V means video with its audio"""
+    match = _EDL_TRACK.match(field.upper())
+    if match:
+        return ("video" if match.group(1) == "V" else "audio"), int(match.group(2) or 1)
+    if field.upper() in ("B", "AA/V", "A/V"):
+        return None, 1
+    raise Exception(f"Unsupported EDL track: {field}")
+
+
+def parse_edl(text, fps):
+    """Events from a CMX 3600 EDL; clips are named by SOURCE FILE, FROM CLIP NAME or reel"""
+    events = []
+    for line in text.splitlines():
+        line = line.strip()
+        event = _EDL_EVENT.match(line)
+        if event:
+            _, reel, track, _, source_in, source_out, record_in, _ = event.groups()
+            source_in, source_out = timecode_to_frames(source_in, fps), timecode_to_frames(source_out, fps)
+            # Black and the zero-length outgoing half of a dissolve place nothing
+            if reel.upper() in _BLACK_REELS or source_out <= source_in:
+                events.append(None)
+                continue
+            track_type, track_index = _edl_track(track)
+            events.append(_event(reel, source_in, source_out, track_type, track_index,
+                                 timecode_to_frames(record_in, fps), source_timecode=True))
+        elif line.startswith("*") and events and events[-1] is not None:
+            key, _, value = line.lstrip("* ").partition(":")
+            if key.upper() == "SOURCE FILE" and value.strip():
+                events[-1]["clip"] = value.strip()
+            elif key.upper() == "FROM CLIP NAME" and value.strip() and "/" not in events[-1]["clip"]:
+                events[-1]["clip"] = value.strip()
+    events = [event for event in events if event is not None]
+    if not events:
+        raise Exception("No clip events found in the EDL")
+    return events
+
+
+def _frames(rational_time, fps):
+    """Frames at fps for an OTIO RationalTime"""
+    if not rational_time:
+        return 0
+    rate = rational_time.get("rate") or fps
+    return round(rational_time.get("value", 0) * fps / rate)
+
+
+def parse_otio(text, fps):
+    """Events from an OpenTimelineIO timeline serialized as JSON"""
+    try:
+        root = json.loads(text) if isinstance(text, str) else text
+    except ValueError as e:
+        raise Exception(f"Invalid OTIO JSON: {str(e)}")
+    if not str(root.get("OTIO_SCHEMA", "")).startswith("Timeline."):
+        raise Exception("OTIO input must be a Timeline")
+
+    offset = _frames(root.get("global_start_time"), fps) if root.get("global_start_time") else 0
+    events = []
+    counts = {"video": 0, "audio": 0}
+    for track in (root.get("tracks") or {}).get("children", []):
+        track_type = "audio" if track.get("kind") == "Audio" else "video"
+        counts[track_type] += 1
+        position = 0
+        for child in track.get("children", []):
+            schema = str(child.get("OTIO_SCHEMA", ""))
+            source_range = child.get("source_range") or {}
+            duration = _frames(source_range.get("duration"), fps)
+            if schema.startswith("Clip."):
+                reference = child.get("media_reference") or {}
+                url = reference.get("target_url")
+                clip = unquote(urlparse(url).path) if url and url.startswith("file:") else (url or child.get("name"))
+                available = (reference.get("available_range") or {}).get("start_time")
+                source_in = _frames(source_range.get("start_time"), fps) - _frames(available, fps)
+                events.append(_event(clip, source_in, source_in + duration, track_type, counts[track_type], offset + position))
+            elif not schema.startswith(("Gap.", "Transition.")):
+                raise Exception(f"Unsupported OTIO item in track {counts[track_type]}: {schema}")
+            if not schema.startswith("Transition."):
+                position += duration
+    if not events:
+        raise Exception("No clips found in the OTIO timeline")
+    return events
+
+
+def parse_entries(entries):
+    """Events from {clip, in, out, track, record_frame, media_type} dicts"""
+    events = []
+    for index, entry in enumerate(entries):
+        unknown = set(entry) - {"clip", "in", "out", "track", "record_frame", "media_type"}
+        if unknown:
+            raise Exception(f"Entry {index}: unknown keys: {', '.join(sorted(unknown))}")
+        if not entry.get("clip"):
+            raise Exception(f"Entry {index}: clip is required")
+        media_type = entry.get("media_type")
+        if media_type is not None and media_type not in MEDIA_TYPES:
+            raise Exception(f"Entry {index}: media_type must be video or audio")
+        for key in ("in", "out", "track", "record_frame"):
+            if entry.get(key) is not None and (not isinstance(entry[key], int) or isinstance(entry[key], bool)):
+                raise Exception(f"Entry {index}: {key} must be a whole number")
+        events.append(_event(entry["clip"], entry.get("in") or 0, entry.get("out"), media_type,
+                             entry.get("track") or 1, entry.get("record_frame")))
+    if not events:
+        raise Exception("entries must contain at least one clip")
+    return events
+
+
+def load_events(connection, edl=None, otio=None, entries=None, file_path=None, fps=None):
+    """Parse the one edit list given as EDL text, OTIO JSON, entries or a file
+
+    fps defaults to the project's timeline frame rate.
+    """
+    sources = [source for source in (edl, otio, entries, file_path) if source is not None]
+    if len(sources) != 1:
+        raise Exception("Give the edit as exactly one of: edl, otio, entries or file_path")
+
+    if file_path:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in EVENT_FILE_TYPES:
+            raise Exception(f"file_path must be one of: {', '.join(EVENT_FILE_TYPES)}")
+        try:
+            with open(os.path.expanduser(file_path), encoding="utf-8-sig") as handle:
+                text = handle.read()
+        except OSError as e:
+            raise Exception(f"Could not read {file_path}: {str(e)}")
+        edl, otio = (text, None) if extension == ".edl" else (None, text)
+
+    if entries is not None:
+        return parse_entries(entries)
+    fps = fps or timeline_frame_rate(connection.project)
+    return parse_edl(edl, fps) if edl is not None else parse_otio(otio, fps)
+
+
+def prepare_events(connection, events, skip_missing=False, fps=None):
+    """Resolve every event's clip in one pass over the media pool index"""
+    clips = connection.find_clips([event["clip"] for event in events])
+    missing = sorted({event["clip"] for event in events if event["clip"] not in clips})
+    if missing and not skip_missing:
+        shown = ", ".join(missing[:10]) + (f" and {len(missing) - 10} more" if len(missing) > 10 else "")
+        raise Exception(f"{len(missing)} clip(s) not found in the media pool: {shown}")
+
+    start_frames = {}
+    prepared = []
+    for index, event in enumerate(events):
+        clip = clips.get(event["clip"])
+        if clip is None:
+            continue
+        source_in, source_out = event["in"], event["out"]
+        if event["source_timecode"]:
+            # EDL source timecodes count from the clip's own start timecode
+            if event["clip"] not in start_frames:
+                start_tc = clip.GetClipProperty("Start TC")
+                if start_tc and fps is None:
+                    fps = timeline_frame_rate(connection.project)
+                start_frames[event["clip"]] = timecode_to_frames(start_tc, fps) if start_tc else 0
+            source_in -= start_frames[event["clip"]]
+            source_out -= start_frames[event["clip"]]
+        if source_in < 0 or (source_out is not None and source_out <= source_in):
+            raise Exception(f"Event {index} ({event['clip']}): source range {source_in}-{source_out} is empty or before the clip starts")
+        prepared.append(dict(event, item=clip, **{"in": source_in, "out": source_out}))
+    return prepared, missing
+
+
+def append_events(connection, timeline, prepared, missing=()):
+    """Place prepared events on a timeline with a single AppendToTimeline call"""
+    project = connection.project
+    start = time.perf_counter()
+
+    # Record frames before the timeline's start are offsets from it, as in EDLs that start at zero
+    timeline_start = timeline.GetStartFrame() or 0
+    records = [event["record"] for event in prepared if event["record"] is not None]
+    shift = timeline_start if records and min(records) < timeline_start else 0
+
+    tracks_added = 0
+    for track_type in MEDIA_TYPES:
+        needed = max((event["track"] for event in prepared if event["track_type"] in (track_type, None)), default=0)
+        while (timeline.GetTrackCount(track_type) or 0) < needed:
+            if not timeline.AddTrack(track_type):
+                raise Exception(f"Could not add {track_type} track {needed} to {timeline.GetName()}")
+            tracks_added += 1
+
+    clip_infos = []
+    for event in prepared:
+        clip_info = {"mediaPoolItem": event["item"], "startFrame": event["in"], "trackIndex": event["track"]}
+        if event["out"] is not None:
+            # endFrame is the last source frame used
+            clip_info["endFrame"] = event["out"] - 1
+        if event["record"] is not None:
+            clip_info["recordFrame"] = event["record"] + shift
+        if event["track_type"]:
+            clip_info["mediaType"] = MEDIA_TYPES[event["track_type"]]
+        clip_infos.append(clip_info)
+
+    original = project.GetCurrentTimeline()
+    switched = original is not None and original.GetName() != timeline.GetName()
+    if switched and not project.SetCurrentTimeline(timeline):
+        raise Exception(f"Could not switch to timeline {timeline.GetName()}")
+    try:
+        items = project.GetMediaPool().AppendToTimeline(clip_infos) if clip_infos else []
+        if clip_infos and not items:
+            # Clip handles are not checked up front; confirm them now and retry once if any went stale
+            clips = connection.find_clips([event["clip"] for event in prepared], validate=True)
+            replaced = [clips.get(event["clip"]) for event in prepared]
+            if all(replaced) and any(clip is not event["item"] for clip, event in zip(replaced, prepared)):
+                for clip_info, clip in zip(clip_infos, replaced):
+                    clip_info["mediaPoolItem"] = clip
+                items = project.GetMediaPool().AppendToTimeline(clip_infos)
+    finally:
+        if switched:
+            project.SetCurrentTimeline(original)
+    elapsed = time.perf_counter() - start
+
+    if clip_infos and not items:
+        raise Exception(f"Resolve did not place any of the {len(clip_infos)} event(s) on {timeline.GetName()}")
+    result = {
+        "status": "success",
+        "message": f"Placed {len(clip_infos)} event(s) on {timeline.GetName()} as {len(items)} timeline item(s)",
+        "timeline": timeline.GetName(),
+        "events": len(clip_infos),
+        "items": len(items),
+        "tracks_added": tracks_added,
+        "ms": round(elapsed * 1000, 2),
+        "events_per_second": round(len(clip_infos) / elapsed, 1) if clip_infos and elapsed else None
+    }
+    if missing:
+        result["missing_clips"] = list(missing)
+    return result
+
+
+@command("build_timeline_from_edl", timeout=300.0, params=(
+    Param("edl", str, None, "A CMX 3600 EDL; clips are matched by SOURCE FILE, FROM CLIP NAME or reel name"),
+    Param("otio", str, None, "An OpenTimelineIO timeline as JSON; clips are matched by media file path or clip name"),
+    Param("entries", list[dict], None, "Events as {\"clip\", \"in\", \"out\", \"track\", \"record_frame\", \"media_type\"}: clip name, path or unique ID, source frames with out exclusive, and video or audio"),
+    Param("file_path", str, None, "An .edl, .otio or .json file to read the edit from"),
+    Param("timeline_name", str, None, "The timeline to build into; created if it does not exist (optional, uses current timeline if not specified)"),
+    Param("skip_missing", bool, False, "Leave out events whose clip is not in the media pool instead of failing (default: False)")
+))
+def build_timeline_from_edl(connection, edl=None, otio=None, entries=None, file_path=None, timeline_name=None, skip_missing=False):
+    """Cut an edit list into a timeline with one media pool lookup pass and one AppendToTimeline call"""
+    events = load_events(connection, edl, otio, entries, file_path)
+    prepared, missing = prepare_events(connection, events, skip_missing)
+
+    created = False
+    if timeline_name and not connection.find_timeline(timeline_name):
+        timeline = connection.project.GetMediaPool().CreateEmptyTimeline(timeline_name)
+        if not timeline:
+            raise Exception(f"Failed to create timeline: {timeline_name}")
+        connection.register_timeline(timeline_name, timeline)
+        created = True
+    else:
+        timeline = get_timeline(connection, timeline_name)
+
+    result = append_events(connection, timeline, prepared, missing)
+    result["created"] = created
+    return result
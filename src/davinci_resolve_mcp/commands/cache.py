@@ -0,0 +1,93 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from .registry import command
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+DEFAULT_TTL = 5.0
+DEFAULT_MAX_ENTRIES = 128
+
+
+class CommandCache:
+    """Read-through cache for query command results with TTL and LRU eviction"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(connection, command_type, params):
+        """Build a hashable key from the connection, command and params"""
+        return (id(connection), command_type, json.dumps(params or {}, sort_keys=True, default=str))
+
+    def get(self, key, record_miss=True):
+        """Return (True, result) on a fresh hit, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, result = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, result
+                del self._entries[key]
+            if record_miss:
+                self.misses += 1
+            return False, None
+
+    def put(self, key, result):
+        """Store a result, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, connection=None):
+        """Drop every cached result, or only those of one connection"""
+        with self._lock:
+            if connection is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if key[0] == id(connection)]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self.invalidations += 1
+
+    def stats(self):
+        """Return counters for tuning the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# Shared cache used by the command executor
+command_cache = CommandCache()
+
+
+@command("get_cache_stats", read_only=True, local=True)
+def get_cache_stats(connection):
+    """Get hit/miss counters for the query result cache"""
+    return command_cache.stats()
@@ -1,9 +1,170 @@
+import fnmatch
+import glob
 import logging
+import os
+import time
+
+from .registry import command, Param
+from .timeline_info import get_timeline, iter_timeline_items
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+CDL_DEFAULTS = {"slope": [1.0, 1.0, 1.0], "offset": [0.0, 0.0, 0.0], "power": [1.0, 1.0, 1.0], "saturation": 1.0}
+
+# ApplyGradeFromDRX modes
+GRADE_MODES = {0: "no keyframes", 1: "source timecode aligned", 2: "start frames aligned"}
+
+
+def _cdl_settings(cdl, node_index):
+    """Turn {"slope": [r, g, b], ...} into the strings SetCDL expects"""
+    unknown = [key for key in cdl if key not in CDL_DEFAULTS]
+    if unknown:
+        raise Exception(f"Unknown CDL values: {', '.join(unknown)}; use {', '.join(CDL_DEFAULTS)}")
+    values = {**CDL_DEFAULTS, **cdl}
+    settings = {"NodeIndex": str(node_index), "Saturation": str(float(values["saturation"]))}
+    for key in ("slope", "offset", "power"):
+        rgb = values[key]
+        if not isinstance(rgb, (list, tuple)) or len(rgb) != 3:
+            raise Exception(f"CDL {key} must be [red, green, blue]")
+        settings[key.capitalize()] = " ".join(str(float(value)) for value in rgb)
+    return settings
+
+
+def _marker_ranges(timeline, color):
+    """Absolute frame ranges of the timeline markers with the given color"""
+    start = timeline.GetStartFrame() or 0
+    return [
+        (start + frame, start + frame + max(int(marker.get("duration", 1)), 1))
+        for frame, marker in (timeline.GetMarkers() or {}).items()
+        if marker.get("color", "").lower() == color.lower()
+    ]
+
+
+def select_items(timeline, track_number=None, name_pattern=None, marker_color=None):
+    """Collect the video items matching every given selector in one walk over the timeline"""
+    ranges = _marker_ranges(timeline, marker_color) if marker_color else None
+    if ranges == []:
+        return []
+
+    start = ("video", track_number, 0) if track_number else None
+    selected = []
+    for _, track_index, _, item in iter_timeline_items(timeline, ("video",), start):
+        if track_number and track_index != track_number:
+            break
+        if name_pattern and not fnmatch.fnmatchcase(item.GetName(), name_pattern):
+            continue
+        if ranges is not None:
+            item_start, item_end = item.GetStart(), item.GetEnd()
+            if not any(frame < item_end and item_start < end for frame, end in ranges):
+                continue
+        selected.append((track_index, item))
+    return selected
+
+
+def apply_grade(timeline, items, cdl=None, lut_path=None, drx_path=None, node_index=1, grade_mode=0):
+    """Apply one grade template to every item; returns the names of the items that failed"""
+    if drx_path:
+        # One call grades the whole selection
+        if not timeline.ApplyGradeFromDRX(drx_path, grade_mode, [item for _, item in items]):
+            return [item.GetName() for _, item in items]
+        return []
+
+    settings = _cdl_settings(cdl, node_index) if cdl is not None else None
+    failed = []
+    for _, item in items:
+        ok = True
+        if settings is not None:
+            ok = item.SetCDL(settings)
+        if lut_path and ok:
+            ok = item.SetLUT(node_index, lut_path)
+        if not ok:
+            failed.append(item.GetName())
+    return failed
+
+
+@command("grade_clips", params=(
+    Param("timeline_name", str, None, "The timeline to grade (optional, uses current timeline if not specified)"),
+    Param("track_number", int, None, "Only grade items on this video track (optional)"),
+    Param("name_pattern", str, None, "Only grade items whose name matches this glob pattern, e.g. \"A001_*\" (optional)"),
+    Param("marker_color", str, None, "Only grade items under a timeline marker of this color (optional)"),
+    Param("select_all", bool, False, "Grade every video item when no other selector is given (default: False)"),
+    Param("cdl", dict, None, "CDL values: {\"slope\": [r, g, b], \"offset\": [r, g, b], \"power\": [r, g, b], \"saturation\": s} (optional)"),
+    Param("lut_path", str, None, "A LUT to apply to the node (optional)"),
+    Param("drx_path", str, None, "A grade exported as DRX, e.g. from a gallery still, to apply instead of cdl/lut_path (optional)"),
+    Param("node_index", int, 1, "The node that receives the CDL or LUT (default: 1)"),
+    Param("grade_mode", int, 0, "How a DRX grade is aligned: 0 no keyframes, 1 source timecode, 2 start frames (default: 0)"),
+    Param("dry_run", bool, False, "Only report which items the selectors match (default: False)")
+))
+def grade_clips(connection, timeline_name=None, track_number=None, name_pattern=None, marker_color=None, select_all=False,
+                cdl=None, lut_path=None, drx_path=None, node_index=1, grade_mode=0, dry_run=False):
+    """Apply one grade template to every timeline item matching the selectors"""
+    if not (track_number or name_pattern or marker_color or select_all):
+        raise Exception("Give a selector (track_number, name_pattern or marker_color) or set select_all to grade every item")
+    if drx_path and (cdl is not None or lut_path):
+        raise Exception("drx_path cannot be combined with cdl or lut_path")
+    if not dry_run and not (cdl is not None or lut_path or drx_path):
+        raise Exception("Give a grade template: cdl, lut_path or drx_path")
+    if drx_path and not os.path.isfile(drx_path):
+        raise Exception(f"DRX file not found: {drx_path}")
+    if grade_mode not in GRADE_MODES:
+        raise Exception(f"grade_mode must be one of: {', '.join(str(mode) for mode in GRADE_MODES)}")
+    if cdl is not None:
+        # Validate before touching any item
+        _cdl_settings(cdl, node_index)
+
+    timeline = get_timeline(connection, timeline_name)
+    start = time.perf_counter()
+    items = select_items(timeline, track_number, name_pattern, marker_color)
+    selected_seconds = time.perf_counter() - start
+
+    if dry_run:
+        return {
+            "status": "success",
+            "matched": len(items),
+            "items": [{"track": track_index, "name": item.GetName()} for track_index, item in items]
+        }
+
+    failed = apply_grade(timeline, items, cdl, lut_path, drx_path, node_index, grade_mode) if items else []
+    elapsed = time.perf_counter() - start
+    graded = len(items) - len(failed)
+    result = {
+        "status": "success" if not failed else "error",
+        "message": f"Graded {graded} of {len(items)} matching item(s)",
+        "matched": len(items),
+        "graded": graded,
+        "select_ms": round(selected_seconds * 1000, 2),
+        "ms": round(elapsed * 1000, 2),
+        "items_per_second": round(len(items) / elapsed, 1) if items and elapsed else None
+    }
+    if failed:
+        result["failed"] = failed
+    return result
+
+
+@command("color_grade_clip", params=(
+    Param("clip_name", str, description="The name of the timeline clip to grade"),
+    Param("track_number", int, None, "The track to search (optional, searches all tracks if not specified)"),
+    Param("lift", list[float], None, "Lift as [red, green, blue], applied as the CDL offset (optional)"),
+    Param("gamma", list[float], None, "Gamma as [red, green, blue], applied as the CDL power (optional)"),
+    Param("gain", list[float], None, "Gain as [red, green, blue], applied as the CDL slope (optional)"),
+    Param("contrast", float, None, "Contrast (optional, not available through the scripting API)"),
+    Param("saturation", float, None, "Saturation (optional)"),
+    Param("hue", float, None, "Hue rotation (optional, not available through the scripting API)")
+))
 def color_grade_clip(connection, clip_name, track_number=None, lift=None, gamma=None, gain=None, contrast=None, saturation=None, hue=None):
     """Apply color grading to a clip in the timeline"""
-    # Implement color grading
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+    if contrast is not None or hue is not None:
+        return {"status": "error", "message": "Contrast and hue cannot be set through the Resolve scripting API; use lift, gamma, gain and saturation"}
+
+    cdl = {}
+    for key, value in (("offset", lift), ("power", gamma), ("slope", gain), ("saturation", saturation)):
+        if value is not None:
+            cdl[key] = value
+    if not cdl:
+        return {"status": "error", "message": "Give at least one of lift, gamma, gain or saturation"}
+
+    result = grade_clips(connection, track_number=track_number, name_pattern=glob.escape(clip_name), cdl=cdl)
+    if not result["matched"]:
+        return {"status": "error", "message": f"Clip not found on the timeline: {clip_name}"}
+    return result
@@ -1,9 +1,24 @@
 import logging
 
+from .registry import command, Param
+from .build_timeline import load_events, prepare_events, append_events
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
-def create_timeline(connection, name, width=1920, height=1080, frame_rate=24.0, set_as_current=True):
+@command("create_timeline", params=(
+    Param("name", str, description="The name of the new timeline"),
+    Param("width", int, 1920, "The width of the timeline in pixels (default: 1920)"),
+    Param("height", int, 1080, "The height of the timeline in pixels (default: 1080)"),
+    Param("frame_rate", float, 24.0, "The frame rate of the timeline (default: 24.0)"),
+    Param("set_as_current", bool, True, "Whether to set the new timeline as the current timeline (default: True)"),
+    Param("edl", str, None, "A CMX 3600 EDL to cut into the new timeline (optional)"),
+    Param("otio", str, None, "An OpenTimelineIO timeline as JSON to cut into the new timeline (optional)"),
+    Param("entries", list[dict], None, "Events to cut into the new timeline, as for build_timeline_from_edl (optional)"),
+    Param("skip_missing", bool, False, "Leave out events whose clip is not in the media pool instead of failing (default: False)")
+))
+def create_timeline(connection, name, width=1920, height=1080, frame_rate=24.0, set_as_current=True,
+                    edl=None, otio=None, entries=None, skip_missing=False):
     """Create a new timeline with the specified parameters"""
     try:
         project = connection.project
@@ -11,17 +26,21 @@ def create_timeline(connection, name, width=1920, height=1080, frame_rate=24.0,
             return {"status": "error", "message": "No project is currently open"}
         
         # Check if a timeline with this name already exists
-        timeline_count = project.GetTimelineCount()
-        for i in range(1, timeline_count + 1):
-            timeline = project.GetTimelineByIndex(i)
-            if timeline and timeline.GetName() == name:
-                return {"status": "error", "message": f"Timeline with name '{name}' already exists"}
+        if connection.find_timeline(name):
+            return {"status": "error", "message": f"Timeline with name '{name}' already exists"}
         
         # Get the media pool (required to create timelines)
         media_pool = project.GetMediaPool()
         if not media_pool:
             return {"status": "error", "message": "Failed to access media pool"}
         
+        # Resolve the seed edit's clips first so a bad edit leaves no empty timeline
+        # or changed settings behind; its timecodes are read at the new frame rate
+        seed = None
+        if edl is not None or otio is not None or entries is not None:
+            fps = max(1, round(frame_rate))
+            seed = prepare_events(connection, load_events(connection, edl, otio, entries, fps=fps), skip_missing, fps)
+        
         # Set project settings before creating timeline
         project.SetSetting("timelineResolutionWidth", str(width))
         project.SetSetting("timelineResolutionHeight", str(height))
@@ -33,6 +52,10 @@ def create_timeline(connection, name, width=1920, height=1080, frame_rate=24.0,
         # If timeline creation failed
         if not timeline:
             return {"status": "error", "message": f"Failed to create timeline: {name}"}
+        
+        connection.register_timeline(name, timeline)
+        
+        seeded = append_events(connection, timeline, *seed) if seed else None
             
         # Get info about the created timeline with safe method access
         timeline_name = ""
@@ -62,7 +85,8 @@ def create_timeline(connection, name, width=1920, height=1080, frame_rate=24.0,
                     "width": width,
                     "height": height
                 }
-            }
+            },
+            **({"seeded": seeded} if seeded else {})
         }
     except Exception as e:
         logger.error(f"Error creating timeline: {str(e)}")
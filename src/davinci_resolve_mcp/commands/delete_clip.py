@@ -1,8 +1,14 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("delete_clip_from_timeline", params=(
+    Param("clip_name", str, description="The name of the timeline clip to delete"),
+    Param("track_number", int, None, "The track to search (optional, searches all tracks if not specified)")
+))
 def delete_clip_from_timeline(connection, clip_name, track_number=None):
     """Delete a clip from the timeline"""
     # Implement clip deletion
@@ -1,24 +1,212 @@
+import builtins
+import hashlib
 import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .registry import command, Param
+from ..script_workers import script_workers
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
-def execute_script(connection, code):
+MAX_SESSIONS = 16
+MAX_SESSION_VARIABLES = 1000
+MAX_SESSION_BYTES = 64 * 1024 * 1024
+MAX_COMPILED_SCRIPTS = 256
+MAX_ISOLATED_TIMEOUT = 3600.0
+
+# Names injected into every script namespace, refreshed before each run
+CONTEXT_NAMES = ("resolve", "project_manager", "project")
+
+
+def _approx_size(namespace, limit=MAX_SESSION_BYTES):
+    """Deep size of a namespace's values, counting up to just past limit
+
+    Follows built-in containers and the attributes of instances of classes
+    the session defined. Resolve handles, modules and functions are counted
+    shallowly since they are not session data.
+    """
+    values = [value for name, value in list(namespace.items()) if name not in CONTEXT_NAMES and name != "__builtins__"]
+    session_classes = {value for value in values if isinstance(value, type)}
+    seen = set()
+    total = 0
+    while values and total <= limit:
+        value = values.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value, 0)
+        if isinstance(value, dict):
+            values.extend(value.keys())
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset, deque)):
+            values.extend(value)
+        elif type(value) in session_classes and hasattr(value, "__dict__"):
+            values.append(vars(value))
+    return total
+
+
+class CompileCache:
+    """LRU cache of compiled script code keyed by a hash of the source"""
+
+    def __init__(self, max_entries=MAX_COMPILED_SCRIPTS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, code):
+        key = hashlib.sha1(code.encode("utf-8")).hexdigest()
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        # Compile outside the lock; a SyntaxError is raised to the caller uncached
+        compiled = compile(code, "<execute_script>", "exec")
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class ScriptSession:
+    """Namespace that persists between execute_script calls"""
+
+    def __init__(self, name):
+        self.name = name
+        self.namespace = {"__builtins__": builtins}
+        self.created = time.time()
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.last_seconds = 0.0
+        # Measured on the Resolve thread after each run, so listing sessions never walks a namespace
+        self.approx_bytes = 0
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "last_ms": round(self.last_seconds * 1000, 3),
+            "variables": len(self.namespace) - 1,
+            "approx_bytes": self.approx_bytes,
+            "age_seconds": round(time.time() - self.created, 1)
+        }
+
+
+class ScriptSessions:
+    """Named script sessions with LRU eviction"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, name, reset=False):
+        """Return the named session, creating it (and evicting the oldest) if needed"""
+        with self._lock:
+            session = None if reset else self._sessions.get(name)
+            if session is None:
+                session = self._sessions[name] = ScriptSession(name)
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    self.evictions += 1
+                    logger.info(f"Evicted script session '{evicted}'")
+            self._sessions.move_to_end(name)
+            return session
+
+    def drop(self, name):
+        with self._lock:
+            return self._sessions.pop(name, None) is not None
+
+    def summaries(self):
+        with self._lock:
+            return [session.summary() for session in self._sessions.values()]
+
+
+# Shared across calls for the server process
+compile_cache = CompileCache()
+script_sessions = ScriptSessions()
+
+
+@command("execute_script", tool_name="execute_davinci_resolve_script", timeout=300.0, params=(
+    Param("code", str, description="The Python code to execute"),
+    Param("session", str, None, "Name of a session whose variables and functions persist between calls (default: fresh namespace)"),
+    Param("reset_session", bool, False, "Start the named session over with an empty namespace (default: False)"),
+))
+def execute_script(connection, code, session=None, reset_session=False):
     """Execute arbitrary Python code in the DaVinci Resolve context"""
+    script_session = script_sessions.get(session, reset_session) if session else None
+    namespace = script_session.namespace if script_session else {"__builtins__": builtins}
+    # Handles change on reconnect, so sessions always see the current ones
+    namespace.update({
+        "resolve": connection.resolve,
+        "project_manager": connection.project_manager,
+        "project": connection.project,
+        "result": None
+    })
+
+    start = time.perf_counter()
     try:
-        # Create a local execution context with access to Resolve API
-        local_context = {
-            "resolve": connection.resolve,
-            "project_manager": connection.project_manager,
-            "project": connection.project,
-            "result": None
-        }
-        
-        # Execute the code
-        exec(code, globals(), local_context)
-        
-        # Return the result if one was set
-        return {"status": "success", "result": local_context.get("result", "Script executed successfully")}
+        exec(compile_cache.compile(code), namespace)
+        response = {"status": "success", "result": namespace.get("result", "Script executed successfully")}
     except Exception as e:
         logger.error(f"Error executing script: {str(e)}")
-        return {"status": "error", "message": f"Script execution error: {str(e)}"} 
\ No newline at end of file
+        response = {"status": "error", "message": f"Script execution error: {str(e)}"}
+    elapsed = time.perf_counter() - start
+
+    if script_session:
+        script_session.calls += 1
+        script_session.errors += response["status"] == "error"
+        script_session.total_seconds += elapsed
+        script_session.last_seconds = elapsed
+        script_session.approx_bytes = _approx_size(script_session.namespace)
+        summary = script_session.summary()
+        if summary["variables"] > MAX_SESSION_VARIABLES or summary["approx_bytes"] > MAX_SESSION_BYTES:
+            script_sessions.drop(session)
+            summary["dropped"] = (
+                f"Session exceeded {MAX_SESSION_VARIABLES} variables or {MAX_SESSION_BYTES} bytes and was discarded"
+            )
+        response["session"] = summary
+    return response
+
+
+@command("execute_script_isolated", tool_name="execute_davinci_resolve_script_isolated", resolve_thread=False,
+         timeout=MAX_ISOLATED_TIMEOUT + 30.0, params=(
+    Param("code", str, description="The Python code to execute"),
+    Param("timeout", float, 300.0, "Seconds the script may run before its worker is killed (default: 300)"),
+))
+def execute_script_isolated(connection, code, timeout=300.0):
+    """Execute Python code in a separate worker process with its own Resolve connection and time and memory limits"""
+    if not 0 < timeout <= MAX_ISOLATED_TIMEOUT:
+        raise Exception(f"timeout must be between 0 and {MAX_ISOLATED_TIMEOUT:.0f} seconds")
+    if connection.host:
+        raise Exception(f"Isolated scripts only run against the Resolve on this machine, not target {connection.target}")
+    return script_workers.run(code, timeout)
+
+
+@command("list_script_sessions", read_only=True, local=True)
+def list_script_sessions(connection):
+    """List persistent script sessions with their run time and approximate memory"""
+    return {
+        "sessions": script_sessions.summaries(),
+        "max_sessions": script_sessions.max_sessions,
+        "evictions": script_sessions.evictions,
+        "compile_cache": compile_cache.stats(),
+        "workers": script_workers.stats()
+    }
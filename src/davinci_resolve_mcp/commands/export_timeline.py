@@ -1,9 +1,283 @@
 import logging
+import os
+import threading
+import time
+
+from .registry import command, Param
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
-def export_timeline(connection, output_path, format="mp4", codec="h264", quality="high", range_type="ALL"):
-    """Export the current timeline to a file"""
-    # Implement timeline export
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+RANGE_TYPES = ("ALL", "IN_OUT")
+QUALITIES = ("least", "low", "medium", "high", "best")
+# Missing means Resolve no longer knows the job, e.g. it was deleted from the queue
+FINISHED_STATUSES = ("Complete", "Failed", "Cancelled", "Missing")
+
+# Seconds before a rendering job's status is read from Resolve again; doubles while it is unchanged
+POLL_INTERVAL_INITIAL = 0.5
+POLL_INTERVAL_MAX = 8.0
+
+
+class RenderJobs:
+    """Render jobs queued by this server, with cached status and polling backoff"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, job_id, timeline_name, output, target=None):
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "target": target,
+                "timeline": timeline_name,
+                "output": output,
+                "status": "Ready",
+                "progress": 0,
+                "interval": POLL_INTERVAL_INITIAL,
+                "next_poll": 0.0
+            }
+
+    def discard(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def job_ids(self, include_finished=False, target=None):
+        with self._lock:
+            return [
+                job_id for job_id, job in self._jobs.items()
+                if (include_finished or job["status"] not in FINISHED_STATUSES) and (target is None or job.get("target") == target)
+            ]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def due(self, job_ids, now):
+        """Jobs whose cached status is old enough to read again"""
+        with self._lock:
+            return [
+                job_id for job_id in job_ids
+                if job_id not in self._jobs
+                or (self._jobs[job_id]["status"] not in FINISHED_STATUSES and self._jobs[job_id]["next_poll"] <= now)
+            ]
+
+    def update(self, job_id, status, now):
+        """Store a fresh status, backing off while the job makes no progress"""
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {
+                "job_id": job_id, "target": None, "timeline": None, "output": None, "interval": POLL_INTERVAL_INITIAL
+            })
+            progress = status.get("CompletionPercentage", 0)
+            unchanged = job.get("status") == status.get("JobStatus") and job.get("progress") == progress
+            job["interval"] = min(job["interval"] * 2, POLL_INTERVAL_MAX) if unchanged else POLL_INTERVAL_INITIAL
+            job["next_poll"] = now + job["interval"]
+            job["status"] = status.get("JobStatus", "Unknown")
+            job["progress"] = progress
+            job["eta_ms"] = status.get("EstimatedTimeRemainingInMs")
+            job["render_ms"] = status.get("TimeTakenToRenderInMs")
+            job["error"] = status.get("Error")
+            job["read_error"] = None
+
+    def failed(self, job_id, error, now):
+        """Keep the last status after a failed read and back off before reading again"""
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {
+                "job_id": job_id, "target": None, "timeline": None, "output": None, "status": "Unknown",
+                "progress": 0, "interval": POLL_INTERVAL_INITIAL
+            })
+            job["interval"] = min(job["interval"] * 2, POLL_INTERVAL_MAX)
+            job["next_poll"] = now + job["interval"]
+            job["read_error"] = error
+
+
+# Jobs queued through this server
+render_jobs = RenderJobs()
+
+
+def _set_format(project, format, codec):
+    """Select the render format and codec, accepting codec names in any case"""
+    for candidate in (codec, codec.upper()):
+        if project.SetCurrentRenderFormatAndCodec(format, candidate):
+            return
+    codecs = project.GetRenderCodecs(format) or {}
+    if not codecs:
+        raise Exception(f"Unknown render format: {format}")
+    raise Exception(f"Codec '{codec}' is not available for {format}; choose one of: {', '.join(codecs.values())}")
+
+
+def _queue_job(project, timeline, job, target=None):
+    """Make timeline current, apply a job's render settings and add it to the render queue"""
+    if not project.SetCurrentTimeline(timeline):
+        raise Exception(f"Could not switch to timeline {job['timeline']}")
+
+    if job.get("preset") and not project.LoadRenderPreset(job["preset"]):
+        raise Exception(f"Render preset not found: {job['preset']}")
+    if job.get("format") and job.get("codec"):
+        _set_format(project, job["format"], job["codec"])
+
+    range_type = job.get("range_type", "ALL")
+    if range_type not in RANGE_TYPES:
+        raise Exception(f"range_type must be one of: {', '.join(RANGE_TYPES)}")
+    settings = {"SelectAllFrames": range_type == "ALL" and job.get("mark_in") is None and job.get("mark_out") is None}
+    if job.get("mark_in") is not None:
+        settings["MarkIn"] = job["mark_in"]
+    if job.get("mark_out") is not None:
+        settings["MarkOut"] = job["mark_out"]
+    if job.get("target_dir"):
+        settings["TargetDir"] = job["target_dir"]
+    # Render settings stick between jobs, so always name the output
+    settings["CustomName"] = job.get("output_name") or job["timeline"]
+    if job.get("quality"):
+        if job["quality"].lower() not in QUALITIES:
+            raise Exception(f"quality must be one of: {', '.join(QUALITIES)}")
+        settings["VideoQuality"] = job["quality"].capitalize()
+    if not project.SetRenderSettings(settings):
+        raise Exception(f"Resolve rejected the render settings for {job['timeline']}")
+
+    job_id = project.AddRenderJob()
+    if not job_id:
+        raise Exception(f"Could not add a render job for {job['timeline']}")
+    render_jobs.add(job_id, job["timeline"], os.path.join(job.get("target_dir") or "", settings["CustomName"]), target)
+    return job_id
+
+
+def queue_renders(connection, jobs, start=True):
+    """Queue one render job per entry and start them together; the current timeline is restored"""
+    project = connection.project
+    if not project:
+        raise Exception("No project is currently open")
+
+    # Resolve every timeline first so a typo does not leave a half-built queue
+    timelines = []
+    for index, job in enumerate(jobs):
+        if job.get("timeline"):
+            timeline = connection.find_timeline(job["timeline"])
+            if not timeline:
+                raise Exception(f"Job {index}: timeline not found: {job['timeline']}")
+        else:
+            timeline = project.GetCurrentTimeline()
+            if not timeline:
+                raise Exception(f"Job {index}: no timeline given and none is current")
+            job = dict(job, timeline=timeline.GetName())
+        timelines.append((timeline, job))
+
+    original = project.GetCurrentTimeline()
+    queued = []
+    try:
+        for index, (timeline, job) in enumerate(timelines):
+            try:
+                queued.append({"job_id": _queue_job(project, timeline, job, connection.target), "timeline": job["timeline"]})
+            except Exception as e:
+                # Leave Resolve's queue as it was before this call
+                for entry in queued:
+                    project.DeleteRenderJob(entry["job_id"])
+                    render_jobs.discard(entry["job_id"])
+                raise Exception(f"Job {index} ({job['timeline']}): {str(e)}")
+    finally:
+        if original:
+            project.SetCurrentTimeline(original)
+
+    started = False
+    if start and queued:
+        started = bool(project.StartRendering(*[entry["job_id"] for entry in queued]))
+        if not started:
+            raise Exception("Render jobs were queued but Resolve did not start rendering")
+
+    return {
+        "status": "success",
+        "message": f"Queued {len(queued)} render job(s)" + (" and started rendering" if started else ""),
+        "jobs": queued,
+        "started": started
+    }
+
+
+@command("export_timeline", params=(
+    Param("output_path", str, description="The path of the file to render to"),
+    Param("format", str, "mp4", "The container format (default: mp4)"),
+    Param("codec", str, "h264", "The video codec (default: h264)"),
+    Param("quality", str, "high", "The render quality: least, low, medium, high or best (default: high)"),
+    Param("range_type", str, "ALL", "The range to render: ALL or IN_OUT (default: ALL)"),
+    Param("timeline_name", str, None, "The timeline to render (optional, uses current timeline if not specified)"),
+    Param("preset", str, None, "A render preset to load before applying the other settings (optional)")
+))
+def export_timeline(connection, output_path, format="mp4", codec="h264", quality="high", range_type="ALL",
+                    timeline_name=None, preset=None):
+    """Export a timeline to a file; rendering runs in the background, poll get_render_status for progress"""
+    target_dir, file_name = os.path.split(os.path.abspath(os.path.expanduser(output_path)))
+    return queue_renders(connection, [{
+        "timeline": timeline_name,
+        "target_dir": target_dir,
+        "output_name": os.path.splitext(file_name)[0],
+        "preset": preset,
+        "format": format,
+        "codec": codec,
+        "quality": quality,
+        "range_type": range_type
+    }])
+
+
+@command("render_timelines", params=(
+    Param("jobs", list[dict], description="Render jobs: {\"timeline\", \"output_name\", \"mark_in\", \"mark_out\", \"range_type\"} plus any of the settings below to override them per job"),
+    Param("target_dir", str, None, "The folder to render into (optional, uses the preset's folder if not specified)"),
+    Param("preset", str, None, "A render preset to load for each job (optional)"),
+    Param("format", str, None, "The container format, e.g. mp4 or mov (optional)"),
+    Param("codec", str, None, "The video codec, e.g. H264 (optional)"),
+    Param("quality", str, None, "The render quality: least, low, medium, high or best (optional)"),
+    Param("start", bool, True, "Start rendering the queued jobs right away (default: True)")
+))
+def render_timelines(connection, jobs, target_dir=None, preset=None, format=None, codec=None, quality=None, start=True):
+    """Queue render jobs for several timelines or ranges in one call and start them together"""
+    if not jobs:
+        raise Exception("jobs must contain at least one render job")
+    defaults = {"target_dir": target_dir, "preset": preset, "format": format, "codec": codec, "quality": quality}
+    return queue_renders(connection, [{**defaults, **{k: v for k, v in job.items() if v is not None}} for job in jobs], start)
+
+
+@command("get_render_status", read_only=True, params=(
+    Param("job_ids", list[str], None, "The render jobs to report on (optional, defaults to unfinished jobs queued by this server on this target)"),
+))
+def get_render_status(connection, job_ids=None):
+    """Get the progress of render jobs without waiting for them"""
+    project = connection.project
+    if not project:
+        raise Exception("No project is currently open")
+
+    job_ids = list(job_ids or render_jobs.job_ids(target=connection.target))
+    now = time.monotonic()
+    # Jobs polled recently are answered from the last reading
+    listed = None
+    for job_id in render_jobs.due(job_ids, now):
+        try:
+            status = project.GetRenderJobStatus(job_id) or {}
+            if not status:
+                # Only a job gone from the queue is Missing; anything else may be a passing hiccup
+                if listed is None:
+                    listed = {job.get("JobId") for job in project.GetRenderJobList() or []}
+                if job_id not in listed:
+                    status = {"JobStatus": "Missing"}
+        except Exception as e:
+            logger.error(f"Error reading render job {job_id}: {str(e)}")
+            render_jobs.failed(job_id, str(e), now)
+            continue
+        if status:
+            render_jobs.update(job_id, status, now)
+        else:
+            render_jobs.failed(job_id, "Resolve returned no status for the job", now)
+
+    jobs = []
+    for job_id in job_ids:
+        job = render_jobs.get(job_id)
+        next_poll = job.pop("next_poll")
+        del job["interval"]
+        if job["status"] not in FINISHED_STATUSES:
+            job["poll_after_seconds"] = round(max(0.0, next_poll - now), 2)
+        jobs.append({key: value for key, value in job.items() if value is not None})
+
+    pending = [job for job in jobs if job["status"] not in FINISHED_STATUSES]
+    return {
+        "rendering": bool(pending) and bool(project.IsRenderingInProgress()),
+        "finished": not pending,
+        "jobs": jobs
+    }
@@ -1,9 +1,244 @@
+import glob
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .registry import command, Param
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+# File types Resolve can import, used when the caller gives no extension filter
+MEDIA_EXTENSIONS = {
+    ".mov", ".mp4", ".m4v", ".mxf", ".avi", ".mkv", ".webm", ".r3d", ".braw", ".ari", ".arx",
+    ".crm", ".dng", ".cin", ".dpx", ".exr", ".tif", ".tiff", ".jpg", ".jpeg", ".png", ".psd",
+    ".wav", ".aif", ".aiff", ".mp3", ".m4a", ".aac", ".flac"
+}
+
+DEFAULT_SCAN_WORKERS = 8
+
+def get_media_folder(media_pool, folder_name, create=True):
+    """Find a bin under the media pool root by name or "a/b" path, creating it if asked"""
+    folder = media_pool.GetRootFolder()
+    if not folder_name or folder_name == folder.GetName():
+        return folder
+    for name in filter(None, folder_name.split("/")):
+        subfolder = next((sub for sub in folder.GetSubFolderList() or [] if sub.GetName() == name), None)
+        if subfolder is None:
+            if not create:
+                return None
+            subfolder = media_pool.AddSubFolder(folder, name)
+            if not subfolder:
+                return None
+        folder = subfolder
+    return folder
+
+def _import_into(media_pool, folder, paths):
+    """Run one ImportMedia call for paths into folder, restoring the current bin"""
+    previous = media_pool.GetCurrentFolder() if folder else None
+    try:
+        if folder:
+            media_pool.SetCurrentFolder(folder)
+        return media_pool.ImportMedia(paths) or []
+    finally:
+        if previous:
+            media_pool.SetCurrentFolder(previous)
+
+@command("import_media", timeout=300.0, params=(
+    Param("file_path", str, description="The path of the media file to import"),
+    Param("folder_name", str, None, "The media pool folder to import into (optional, uses the current folder if not specified)")
+))
 def import_media(connection, file_path, folder_name=None):
     """Import media file into the project"""
-    # Implement media import
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+    try:
+        if not os.path.exists(file_path):
+            return {"status": "error", "message": f"File not found: {file_path}"}
+        
+        media_pool = connection.project.GetMediaPool()
+        folder = get_media_folder(media_pool, folder_name) if folder_name else None
+        if folder_name and not folder:
+            return {"status": "error", "message": f"Failed to create media pool folder: {folder_name}"}
+        
+        items = _import_into(media_pool, folder, [file_path])
+        connection.invalidate_media_folder(folder)
+        if not items:
+            return {"status": "error", "message": f"DaVinci Resolve could not import: {file_path}"}
+        
+        return {
+            "status": "success",
+            "message": f"Imported {file_path}",
+            "clips": [item.GetName() for item in items]
+        }
+    except Exception as e:
+        logger.error(f"Error importing media: {str(e)}")
+        return {"status": "error", "message": f"Error importing media: {str(e)}"}
+
+def _walk(directory, recursive):
+    """List the files under a directory, and the directories that could not be read"""
+    errors = []
+    if not recursive:
+        try:
+            return [entry.path for entry in os.scandir(directory) if entry.is_file()], errors
+        except OSError as e:
+            return [], [{"path": directory, "error": e.strerror or str(e)}]
+    files = []
+    onerror = lambda e: errors.append({"path": e.filename, "error": e.strerror or str(e)})
+    for root, _, names in os.walk(directory, onerror=onerror):
+        files.extend(os.path.join(root, name) for name in names)
+    return files, errors
+
+def _stat(path):
+    """Return (real path, size), or (path, None, error) if the file cannot be read"""
+    try:
+        if not os.access(path, os.R_OK):
+            return path, None, "Permission denied"
+        return os.path.realpath(path), os.stat(path).st_size
+    except OSError as e:
+        return path, None, e.strerror or str(e)
+
+def scan_media(paths, recursive=True, extensions=None, min_size=0, max_size=None, workers=DEFAULT_SCAN_WORKERS):
+    """Expand files, directories and glob patterns into (path, size) pairs
+    
+    Directory walks and stat calls run on a thread pool since they are
+    dominated by filesystem latency. Also returns the number of files seen
+    and {"path", "error"} entries for inputs that do not exist or cannot be read.
+    """
+    extensions = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions} if extensions else MEDIA_EXTENSIONS
+    
+    files, directories, errors = [], [], []
+    for pattern in paths:
+        if glob.has_magic(pattern):
+            matches = glob.glob(os.path.expanduser(pattern), recursive=True)
+            if not matches:
+                errors.append({"path": pattern, "error": "No files match"})
+        else:
+            matches = [os.path.expanduser(pattern)]
+            if not os.path.lexists(matches[0]):
+                errors.append({"path": pattern, "error": "No such file or directory"})
+                continue
+        for match in matches:
+            (directories if os.path.isdir(match) else files).append(match)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for listing, walk_errors in pool.map(lambda directory: _walk(directory, recursive), directories):
+            files.extend(listing)
+            errors.extend(walk_errors)
+        candidates = [path for path in files if os.path.splitext(path)[1].lower() in extensions]
+        stats = pool.map(_stat, candidates)
+        
+        found, seen = [], set()
+        for entry in stats:
+            if len(entry) == 3:
+                errors.append({"path": entry[0], "error": entry[2]})
+                continue
+            if entry[0] in seen:
+                continue
+            path, size = entry
+            if size < min_size or (max_size is not None and size > max_size):
+                continue
+            seen.add(path)
+            found.append((path, size))
+    
+    return found, len(files), errors
+
+def _bin_paths(paths):
+    """Media pool bin for each file's directory, relative to the directories' common root
+
+    The root's own name is kept, so /shoot/day1 goes to day1 and /a/day1 and
+    /b/day1 go to a/day1 and b/day1 instead of sharing one bin.
+    """
+    directories = {os.path.dirname(path) for path in paths}
+    if not directories:
+        return {}
+    root = os.path.commonpath(list(directories))
+    bins = {}
+    for directory in directories:
+        relative = os.path.relpath(directory, root)
+        parts = [os.path.basename(root)] + ([] if relative == "." else relative.split(os.sep))
+        bins[directory] = "/".join(part for part in parts if part) or None
+    return bins
+
+def _imported_bytes(items, batch):
+    """Total size of the files behind the clips ImportMedia returned"""
+    if len(items) == len(batch):
+        return sum(size for _, size in batch)
+    sizes = dict(batch)
+    total = 0
+    for item in items:
+        path = item.GetClipProperty("File Path")
+        total += sizes.get(os.path.realpath(path), 0) if path else 0
+    return total
+
+@command("import_media_bulk", timeout=600.0, params=(
+    Param("paths", list[str], description="Files, directories or glob patterns to import (e.g. /shoot/day1, /shoot/**/*.mov)"),
+    Param("folder_name", str, None, "The media pool folder to import into (optional, uses the current folder if not specified)"),
+    Param("mirror_directories", bool, False, "Import each source directory into a media pool folder of the same name (default: False)"),
+    Param("recursive", bool, True, "Walk directories recursively (default: True)"),
+    Param("extensions", list[str], None, "File extensions to import, e.g. [\"mov\", \"wav\"] (optional, defaults to common media types)"),
+    Param("min_size", int, 0, "Skip files smaller than this many bytes (default: 0)"),
+    Param("max_size", int, None, "Skip files larger than this many bytes (optional)"),
+    Param("skip_existing", bool, True, "Skip files that are already in the media pool (default: True)")
+))
+def import_media_bulk(connection, paths, folder_name=None, mirror_directories=False, recursive=True,
+                      extensions=None, min_size=0, max_size=None, skip_existing=True):
+    """Import many media files with one ImportMedia call per target folder"""
+    try:
+        media_pool = connection.project.GetMediaPool()
+        
+        scan_start = time.perf_counter()
+        found, scanned, errors = scan_media(paths, recursive, extensions, min_size, max_size)
+        scan_seconds = time.perf_counter() - scan_start
+        
+        duplicates = 0
+        if skip_existing and found:
+            existing = {
+                os.path.realpath(clip["path"])
+                for clip in connection.media_pool_clips()
+                if clip["path"]
+            }
+            before = len(found)
+            found = [(path, size) for path, size in found if path not in existing]
+            duplicates = before - len(found)
+        
+        # Group by destination so Resolve sees one ImportMedia call per folder
+        bins = _bin_paths(path for path, _ in found) if mirror_directories else {}
+        batches = {}
+        for path, size in found:
+            target = bins[os.path.dirname(path)] if mirror_directories else folder_name
+            batches.setdefault(target, []).append((path, size))
+        
+        import_start = time.perf_counter()
+        imported, imported_bytes, failed = [], 0, []
+        for target, batch in batches.items():
+            folder = get_media_folder(media_pool, target) if target else None
+            if target and not folder:
+                failed.append(f"{len(batch)} files: could not create folder {target}")
+                continue
+            items = _import_into(media_pool, folder, [path for path, _ in batch])
+            connection.invalidate_media_folder(folder)
+            imported.extend(item.GetName() for item in items)
+            imported_bytes += _imported_bytes(items, batch)
+            if len(items) != len(batch):
+                failed.append(f"{len(batch) - len(items)} of {len(batch)} files: import into {target or 'current folder'} failed")
+        import_seconds = time.perf_counter() - import_start
+        
+        total_seconds = scan_seconds + import_seconds
+        return {
+            "status": "success" if not failed and not errors else "partial",
+            "files_scanned": scanned,
+            "files_matched": len(found) + duplicates,
+            "skipped_existing": duplicates,
+            "imported": len(imported),
+            "folders": [target or "current folder" for target in batches],
+            "failed": failed,
+            "skipped": errors,
+            "bytes_imported": imported_bytes,
+            "scan_seconds": round(scan_seconds, 3),
+            "import_seconds": round(import_seconds, 3),
+            "files_per_second": round(len(imported) / total_seconds, 1) if total_seconds else None,
+            "bytes_per_second": round(imported_bytes / total_seconds) if total_seconds else None
+        }
+    except Exception as e:
+        logger.error(f"Error importing media: {str(e)}")
+        return {"status": "error", "message": f"Error importing media: {str(e)}"}
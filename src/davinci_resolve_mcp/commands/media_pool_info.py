@@ -1,9 +1,33 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
-def get_media_pool_info(connection):
+DEFAULT_CLIP_LIMIT = 500
+
+@command("get_media_pool_info", cacheable=True, params=(
+    Param("folder", str, None, "Only list clips in this folder, given as a path such as Master/Day 1 (optional)"),
+    Param("limit", int, DEFAULT_CLIP_LIMIT, f"The maximum number of clips to list (default: {DEFAULT_CLIP_LIMIT})")
+))
+def get_media_pool_info(connection, folder=None, limit=DEFAULT_CLIP_LIMIT):
     """Get information about the media pool"""
-    # Implement media pool info retrieval
-    return {"status": "not_implemented", "message": "Method not yet implemented"} 
\ No newline at end of file
+    project = connection.project
+    if not project:
+        raise Exception("No project is currently open")
+    
+    # Served from the connection's media pool index
+    folders = [{"path": path, "clip_count": count} for path, count in connection.media_pool_folders()]
+    clips = connection.media_pool_clips(folder)
+    
+    if folder and not any(entry["path"] == folder for entry in folders):
+        raise Exception(f"Media pool folder not found: {folder}")
+    
+    return {
+        "folder_count": len(folders),
+        "clip_count": sum(entry["clip_count"] for entry in folders),
+        "folders": folders,
+        "clips": clips[:limit],
+        "truncated": len(clips) > limit
+    }
@@ -1,8 +1,11 @@
 import logging
 
+from .registry import command
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("get_project_info", cacheable=True)
 def get_project_info(connection):
     """Get information about the current project"""
     project = connection.project
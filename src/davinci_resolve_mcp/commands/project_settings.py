@@ -1,8 +1,16 @@
 import logging
 
+from .registry import command, Param
+
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
+@command("set_project_settings", params=(
+    Param("timeline_resolution", str, None, "The timeline resolution as WIDTHxHEIGHT, e.g. 1920x1080 (optional)"),
+    Param("timeline_frame_rate", float, None, "The timeline frame rate (optional)"),
+    Param("color_science", str, None, "The color science mode (optional)"),
+    Param("colorspace", str, None, "The timeline color space (optional)")
+))
 def set_project_settings(connection, timeline_resolution=None, timeline_frame_rate=None, color_science=None, colorspace=None):
     """Set various project settings"""
     # Implement project settings modification
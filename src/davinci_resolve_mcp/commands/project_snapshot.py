@@ -0,0 +1,124 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from .registry import command, Param
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+SNAPSHOT_FIELDS = ("project", "timelines", "current_timeline", "settings")
+
+# Recent snapshots by version for each target, so callers can ask for changes since one
+_MAX_HISTORY = 32
+_histories = {}
+_history_lock = threading.Lock()
+
+
+def _version(snapshot):
+    """Content hash of a snapshot, stable across calls"""
+    payload = json.dumps(snapshot, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def _remember(target, version, snapshot, since_version=None):
+    """Store a snapshot and return the one stored under since_version, if any"""
+    with _history_lock:
+        history = _histories.setdefault(target, OrderedDict())
+        previous = history.get(since_version) if since_version else None
+        history[version] = snapshot
+        history.move_to_end(version)
+        while len(history) > _MAX_HISTORY:
+            history.popitem(last=False)
+        return previous
+
+
+def _diff(old, new):
+    """Return the sections of new that differ from old, and those old did not have
+
+    Sections missing from old were not requested last time, so there is
+    nothing to diff against and they are returned whole.
+    """
+    changes, new_sections = {}, {}
+    for field, value in new.items():
+        if field not in old:
+            new_sections[field] = value
+        elif old[field] == value:
+            continue
+        elif field == "settings":
+            previous = old[field]
+            changes[field] = {
+                "changed": {key: val for key, val in value.items() if previous.get(key) != val},
+                "removed": [key for key in previous if key not in value]
+            }
+        elif field == "timelines":
+            previous = set(old[field]["names"])
+            current = set(value["names"])
+            changes[field] = {
+                "count": value["count"],
+                "added": [name for name in value["names"] if name not in previous],
+                "removed": [name for name in old[field]["names"] if name not in current]
+            }
+        else:
+            changes[field] = value
+    return changes, new_sections
+
+
+@command("get_project_snapshot", read_only=True, params=(
+    Param("fields", list[str], None, "Sections to include: project, timelines, current_timeline, settings (optional, defaults to all)"),
+    Param("since_version", str, None, "Version from an earlier snapshot; only the sections that changed since then are returned (optional)")
+))
+def get_project_snapshot(connection, fields=None, since_version=None):
+    """Get project, timeline and settings state in one bulk pass"""
+    project = connection.project
+
+    if not project:
+        raise Exception("No project is currently open")
+
+    if fields:
+        unknown = [field for field in fields if field not in SNAPSHOT_FIELDS]
+        if unknown:
+            raise Exception(f"Unknown snapshot fields: {', '.join(unknown)}")
+    else:
+        fields = SNAPSHOT_FIELDS
+
+    snapshot = {}
+    if "project" in fields:
+        snapshot["project"] = {"name": project.GetName()}
+
+    if "timelines" in fields:
+        names = connection.timeline_names()
+        snapshot["timelines"] = {"count": len(names), "names": names}
+
+    if "current_timeline" in fields:
+        current_timeline = project.GetCurrentTimeline()
+        snapshot["current_timeline"] = current_timeline.GetName() if current_timeline else None
+
+    if "settings" in fields:
+        # GetSetting with no key returns every project setting at once
+        try:
+            snapshot["settings"] = dict(project.GetSetting() or {})
+        except Exception as e:
+            logger.error(f"Error in GetSetting: {str(e)}")
+            snapshot["settings"] = {}
+
+    version = _version(snapshot)
+    previous = _remember(connection.target, version, snapshot, since_version)
+
+    if since_version and since_version == version:
+        return {"version": version, "unchanged": True}
+
+    if previous is not None:
+        changes, new_sections = _diff(previous, snapshot)
+        result = {"version": version, "since_version": since_version, "changes": changes}
+        if new_sections:
+            result["new_sections"] = new_sections
+        return result
+
+    if since_version:
+        # Unknown or expired version: the caller has to replace its state, not merge into it
+        return {"version": version, "since_version": since_version, "resync": True, **snapshot}
+
+    return {"version": version, **snapshot}
@@ -0,0 +1,159 @@
+"""
+Table of every command the server can run.
+
+Command modules register their handlers with the @command decorator together
+with a declarative parameter schema. The executor dispatches through this
+table and tools.register_tools generates one MCP tool per entry.
+"""
+import logging
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+
+class _Required:
+    def __repr__(self):
+        return "REQUIRED"
+
+
+# Marker default for parameters that callers must supply
+REQUIRED = _Required()
+
+# Seconds a tool call waits for a command before giving up on it
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class Param:
+    """One parameter accepted by a command"""
+    name: str
+    type: Any = str
+    default: Any = REQUIRED
+    description: str = ""
+    aliases: Tuple[str, ...] = ()
+
+    @property
+    def required(self) -> bool:
+        return self.default is REQUIRED
+
+    def check(self, value):
+        """Raise if value, or any entry of a list value, does not match the declared type"""
+        value = _check_type(value, self.type, f"Parameter '{self.name}'")
+        item_type = (typing.get_args(self.type) or (Any,))[0]
+        if isinstance(value, list) and item_type is not Any:
+            value = [
+                _check_type(item, item_type, f"Parameter '{self.name}' entry {index}")
+                for index, item in enumerate(value)
+            ]
+        return value
+
+
+def _check_type(value, declared, label):
+    expected = typing.get_origin(declared) or declared
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, expected):
+        raise Exception(
+            f"{label} must be of type {getattr(expected, '__name__', expected)}, got {type(value).__name__}"
+        )
+    return value
+
+
+class BoundParams(dict):
+    """Handler kwargs already validated against one command's schema"""
+
+    def __init__(self, command, kwargs):
+        super().__init__(kwargs)
+        self.command = command
+
+
+@dataclass
+class CommandSpec:
+    """A registered command: handler, parameter schema and caching traits"""
+    name: str
+    handler: Callable
+    params: Tuple[Param, ...] = ()
+    description: str = ""
+    read_only: bool = False
+    cacheable: bool = False
+    tool_name: str = None
+    expose: bool = True
+    local: bool = False
+    resolve_thread: bool = True
+    timeout: float = DEFAULT_TIMEOUT
+    _lookup: Dict[str, Param] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        for param in self.params:
+            self._lookup[param.name] = param
+            for alias in param.aliases:
+                self._lookup[alias] = param
+
+    def bind(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate params against the schema and return handler kwargs
+
+        Params this command already bound are returned as they are, so a call
+        is validated once however many layers it passes through.
+        """
+        if isinstance(params, BoundParams) and params.command == self.name:
+            return params
+        kwargs = {}
+        for key, value in (params or {}).items():
+            param = self._lookup.get(key)
+            if param is None:
+                raise Exception(f"Unknown parameter for {self.name}: {key}")
+            # None means "not given" so the declared default applies
+            if value is not None:
+                kwargs[param.name] = param.check(value)
+
+        for param in self.params:
+            if param.name not in kwargs:
+                if param.required:
+                    raise Exception(f"Missing required parameter for {self.name}: {param.name}")
+                kwargs[param.name] = param.default
+        return BoundParams(self.name, kwargs)
+
+
+# All registered commands by name
+COMMANDS: Dict[str, CommandSpec] = {}
+
+
+def command(name, params=(), read_only=False, cacheable=False, tool_name=None, expose=True,
+            local=False, resolve_thread=True, timeout=DEFAULT_TIMEOUT):
+    """Register the decorated function as the handler for a command
+
+    local marks commands that never call into Resolve, so they can run on
+    the event loop instead of queueing behind Resolve work. resolve_thread=False
+    marks blocking commands that do not use the server's Resolve handles, so
+    they run on a general worker thread and do not hold up other commands.
+    """
+    def decorator(func):
+        if name in COMMANDS:
+            raise ValueError(f"Command already registered: {name}")
+        description = (func.__doc__ or "").strip()
+        COMMANDS[name] = CommandSpec(
+            name=name,
+            handler=func,
+            params=tuple(params),
+            description=description,
+            read_only=read_only or cacheable,
+            cacheable=cacheable,
+            tool_name=tool_name or name,
+            expose=expose,
+            local=local,
+            resolve_thread=resolve_thread,
+            timeout=timeout
+        )
+        return func
+    return decorator
+
+
+def get_command(name) -> CommandSpec:
+    """Return the spec for a command or raise if it does not exist"""
+    spec = COMMANDS.get(name)
+    if spec is None:
+        raise Exception(f"Command not implemented: {name}")
+    return spec
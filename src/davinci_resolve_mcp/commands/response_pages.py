@@ -0,0 +1,14 @@
+import logging
+
+from .registry import command, Param
+from ..responses import next_page
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+@command("get_response_page", local=True, params=(
+    Param("token", str, description="Continuation token from a response that was too large to return at once"),
+))
+def get_response_page(connection, token):
+    """Get the next page of a response that was cut to fit the response size budget"""
+    return next_page(token)
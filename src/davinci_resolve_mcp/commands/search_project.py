@@ -0,0 +1,25 @@
+import logging
+
+from .registry import command, Param
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+MAX_RESULTS = 1000
+
+@command("search_project", read_only=True, timeout=300.0, params=(
+    Param("query", str, description="Words to find; each must start a word in a timeline, item or clip name, media path, marker name or note, or clip metadata"),
+    Param("kinds", list[str], None, "Only return these kinds of results: timeline, clip, item, marker (optional)"),
+    Param("timeline_name", str, None, "Only return results from this timeline (optional)"),
+    Param("limit", int, 50, f"Maximum number of results (default: 50, at most {MAX_RESULTS})"),
+    Param("refresh", bool, False, "Re-read the whole project first, e.g. after edits made in Resolve's UI (default: False)")
+))
+def search_project(connection, query, kinds=None, timeline_name=None, limit=50, refresh=False):
+    """Search timelines, timeline items, markers and media pool clips from an index kept up to date incrementally"""
+    if not 0 < limit <= MAX_RESULTS:
+        raise Exception(f"limit must be between 1 and {MAX_RESULTS}")
+    
+    update = connection.search_index.update(connection, full=refresh)
+    result = connection.search_index.search(query, kinds, timeline_name, limit)
+    result["index"] = update
+    return result
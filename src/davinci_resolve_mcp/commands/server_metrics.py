@@ -0,0 +1,51 @@
+import logging
+
+from .registry import command, Param
+from .cache import command_cache
+from ..metrics import metrics
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+METRICS_FORMATS = ("json", "prometheus")
+
+@command("get_server_metrics", read_only=True, local=True, params=(
+    Param("format", str, "json", "Output format: json or prometheus (default: json)"),
+))
+def get_server_metrics(connection, format="json"):
+    """Get per-command latency percentiles and Resolve API call counts"""
+    if format not in METRICS_FORMATS:
+        raise Exception(f"format must be one of: {', '.join(METRICS_FORMATS)}")
+    
+    if format == "prometheus":
+        return {"format": "prometheus", "text": metrics.prometheus()}
+    
+    result = metrics.snapshot()
+    result["cache"] = command_cache.stats()
+    result["connection"] = connection.health()
+    result["coalescing"] = connection.coalescer.stats()
+    return result
+
+# Writes a file, so it runs on a worker thread instead of the event loop
+@command("dump_server_metrics", resolve_thread=False, params=(
+    Param("dump_path", str, None, "Append the per-command metrics as JSON lines to this file (optional)"),
+    Param("reset", bool, False, "Clear the counters afterwards (default: False)")
+))
+def dump_server_metrics(connection, dump_path=None, reset=False):
+    """Write the server metrics to a file for offline analysis and/or clear them"""
+    if not dump_path and not reset:
+        raise Exception("Give a dump_path, reset=True or both")
+    
+    result = {"status": "success"}
+    if dump_path:
+        try:
+            result["dumped_lines"] = metrics.dump_jsonl(dump_path)
+        except OSError as e:
+            logger.error(f"Error writing metrics to {dump_path}: {str(e)}")
+            raise Exception(f"Could not write metrics to {dump_path}: {str(e)}")
+    
+    if reset:
+        metrics.reset()
+        result["reset"] = True
+    
+    return result
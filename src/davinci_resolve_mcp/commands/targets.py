@@ -0,0 +1,22 @@
+import logging
+
+from .registry import command
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+@command("list_targets", read_only=True, local=True)
+def list_targets(connection):
+    """List the Resolve instances this server can drive and the state of each connection"""
+    # Imported here because the connection module imports this package
+    from ..connection import get_connection_pool
+    
+    pool = get_connection_pool()
+    connections = {pool_connection.target: pool_connection for pool_connection in pool.connections()}
+    targets = []
+    for name, host in pool.targets.items():
+        if name in connections:
+            targets.append(connections[name].health())
+        else:
+            targets.append({"target": name, "host": host, "connected": False, "connecting": False})
+    return {"default": pool.default, "targets": targets}
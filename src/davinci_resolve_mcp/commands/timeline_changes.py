@@ -0,0 +1,17 @@
+import logging
+
+from .registry import command, Param
+
+# Configure logging
+logger = logging.getLogger("DaVinciCommands")
+
+@command("get_changes_since", read_only=True, params=(
+    Param("version", str, None, "Version from an earlier call; only timeline changes made after it are returned (optional, omit to get the current version and a summary)"),
+    Param("full_scan", bool, False, "Re-read every timeline, to catch edits made in Resolve itself (default: False)")
+))
+def get_changes_since(connection, version=None, full_scan=False):
+    """Get the timelines, tracks and items that changed since a version"""
+    if not connection.project:
+        raise Exception("No project is currently open")
+    
+    return connection.changes.changes_since(connection, version, full_scan)
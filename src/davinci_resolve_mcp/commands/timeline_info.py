@@ -1,27 +1,40 @@
 import logging
+import re
+from itertools import islice
+
+from .registry import command, Param
 
 # Configure logging
 logger = logging.getLogger("DaVinciCommands")
 
-def get_timeline_info(connection, timeline_name=None):
-    """Get information about a timeline"""
+TRACK_TYPES = ("video", "audio", "subtitle")
+
+# Timeline item fields and how to read them; each costs Resolve calls per item
+ITEM_FIELDS = {
+    "name": lambda item: item.GetName(),
+    "start": lambda item: item.GetStart(),
+    "end": lambda item: item.GetEnd(),
+    "duration": lambda item: item.GetDuration(),
+    "unique_id": lambda item: item.GetUniqueId(),
+    "media_path": lambda item: _media_path(item)
+}
+
+DEFAULT_ITEM_FIELDS = ("name", "start", "end")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def _media_path(item):
+    media_pool_item = item.GetMediaPoolItem()
+    return media_pool_item.GetClipProperty("File Path") if media_pool_item else None
+
+def get_timeline(connection, timeline_name=None):
+    """Return the named timeline, or the current one if no name is given"""
     if timeline_name:
         # Try to find the named timeline
-        timeline_count = connection.project.GetTimelineCount()
-        found_timeline = None
+        timeline = connection.find_timeline(timeline_name)
         
-        # Search for the timeline by name
-        for i in range(1, timeline_count + 1):
-            timeline = connection.project.GetTimelineByIndex(i)
-            if timeline and timeline.GetName() == timeline_name:
-                found_timeline = timeline
-                break
-        
-        if not found_timeline:
+        if not timeline:
             raise Exception(f"Timeline not found: {timeline_name}")
-        
-        connection.project.SetCurrentTimeline(timeline_name)
-        timeline = connection.project.GetCurrentTimeline()
     else:
         # Use the current timeline
         timeline = connection.project.GetCurrentTimeline()
@@ -29,6 +42,37 @@ def get_timeline_info(connection, timeline_name=None):
     if not timeline:
         raise Exception("No timeline is currently active")
     
+    return timeline
+
+def timeline_frame_rate(project):
+    """Integer timecode base for the project's timeline frame rate"""
+    try:
+        return max(1, round(float(project.GetSetting("timelineFrameRate") or 24)))
+    except (TypeError, ValueError):
+        return 24
+
+def timecode_to_frames(timecode, fps):
+    """Frames in a non-drop HH:MM:SS:FF timecode"""
+    parts = re.split(r"[:;]", timecode.strip())
+    if len(parts) != 4 or not all(part.isdigit() for part in parts):
+        raise Exception(f"Invalid timecode: {timecode}")
+    hours, minutes, seconds, frames = (int(part) for part in parts)
+    return ((hours * 60 + minutes) * 60 + seconds) * fps + frames
+
+def frames_to_timecode(frames, fps):
+    """Non-drop HH:MM:SS:FF timecode for a frame count"""
+    seconds, frame = divmod(frames, fps)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return f"{hour:02d}:{minute:02d}:{second:02d}:{frame:02d}"
+
+@command("get_timeline_info", cacheable=True, params=(
+    Param("timeline_name", str, None, "The name of the timeline to get info on (optional, uses current timeline if not specified)", aliases=("name",)),
+))
+def get_timeline_info(connection, timeline_name=None):
+    """Get information about a timeline"""
+    timeline = get_timeline(connection, timeline_name)
+    
     # Get basic timeline info
     result = {
         "name": timeline.GetName(),
@@ -40,4 +84,89 @@ def get_timeline_info(connection, timeline_name=None):
         }
     }
     
-    return result 
\ No newline at end of file
+    return result
+
+@command("set_current_timeline", params=(
+    Param("timeline_name", str, description="The timeline to make current", aliases=("name",)),
+))
+def set_current_timeline(connection, timeline_name):
+    """Make a timeline current, so commands that act on the current timeline use it"""
+    timeline = get_timeline(connection, timeline_name)
+    if not connection.project.SetCurrentTimeline(timeline):
+        raise Exception(f"Failed to switch to timeline: {timeline_name}")
+    return {"status": "success", "message": f"Switched to timeline {timeline_name}", "current_timeline": timeline_name}
+
+def _parse_cursor(cursor, track_types):
+    """Turn a 'type:track:offset' cursor into its parts"""
+    if not cursor:
+        return track_types[0], 1, 0
+    try:
+        track_type, track_index, offset = cursor.split(":")
+        track_index, offset = int(track_index), int(offset)
+    except ValueError:
+        raise Exception(f"Invalid cursor: {cursor}")
+    if track_type not in track_types or track_index < 1 or offset < 0:
+        raise Exception(f"Invalid cursor: {cursor}")
+    return track_type, track_index, offset
+
+def iter_timeline_items(timeline, track_types=TRACK_TYPES, start=None):
+    """Yield (track_type, track_index, position, item), one track at a time
+    
+    start is a (track_type, track_index, position) tuple to resume from.
+    Each track's item list is only fetched once iteration reaches it.
+    """
+    start_type, start_track, start_position = start or (track_types[0], 1, 0)
+    for track_type in track_types[track_types.index(start_type):]:
+        first_track = start_track if track_type == start_type else 1
+        for track_index in range(first_track, (timeline.GetTrackCount(track_type) or 0) + 1):
+            items = timeline.GetItemListInTrack(track_type, track_index) or []
+            first = start_position if (track_type, track_index) == (start_type, start_track) else 0
+            for position in range(first, len(items)):
+                yield track_type, track_index, position, items[position]
+
+@command("list_timeline_items", cacheable=True, params=(
+    Param("timeline_name", str, None, "The timeline to list (optional, uses current timeline if not specified)"),
+    Param("fields", list[str], None, f"Item fields to return: {', '.join(ITEM_FIELDS)} (default: {', '.join(DEFAULT_ITEM_FIELDS)})"),
+    Param("track_types", list[str], None, "Track types to include: video, audio, subtitle (default: all)"),
+    Param("cursor", str, None, "The next_cursor from the previous page (optional, starts at the first item)"),
+    Param("limit", int, DEFAULT_PAGE_SIZE, f"The maximum number of items per page (default: {DEFAULT_PAGE_SIZE}, max: {MAX_PAGE_SIZE})")
+))
+def list_timeline_items(connection, timeline_name=None, fields=None, track_types=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """List the items on a timeline's tracks one bounded page at a time"""
+    fields = list(fields or DEFAULT_ITEM_FIELDS)
+    unknown = [field for field in fields if field not in ITEM_FIELDS]
+    if unknown:
+        raise Exception(f"Unknown item fields: {', '.join(unknown)}")
+    
+    track_types = tuple(track_types or TRACK_TYPES)
+    unknown = [track_type for track_type in track_types if track_type not in TRACK_TYPES]
+    if unknown:
+        raise Exception(f"Unknown track types: {', '.join(unknown)}")
+    
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    timeline = get_timeline(connection, timeline_name)
+    start = _parse_cursor(cursor, track_types)
+    
+    # Read one item past the page to know whether there is a next page
+    page = list(islice(iter_timeline_items(timeline, track_types, start), limit + 1))
+    next_cursor = None
+    if len(page) > limit:
+        track_type, track_index, position, _ = page.pop()
+        next_cursor = f"{track_type}:{track_index}:{position}"
+    
+    items = []
+    for track_type, track_index, position, item in page:
+        entry = {"track_type": track_type, "track": track_index, "index": position}
+        for field in fields:
+            try:
+                entry[field] = ITEM_FIELDS[field](item)
+            except Exception as e:
+                logger.error(f"Error reading item {field}: {str(e)}")
+                entry[field] = None
+        items.append(entry)
+    
+    return {
+        "timeline": timeline.GetName(),
+        "items": items,
+        "next_cursor": next_cursor
+    }
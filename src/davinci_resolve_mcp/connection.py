@@ -1,10 +1,26 @@
+import asyncio
+import functools
 import logging
 import os
 import sys
 import platform
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from typing import Dict, Any
 
+from .indexes import TimelineIndex, MediaPoolIndex
+from .change_feed import ChangeFeed, BROAD_COMMANDS
+from .search_index import SearchIndex
+from .metrics import profile_handle
+from .single_flight import SingleFlight
+from .commands import (
+    execute_command as dispatch_command, bind_command, peek_command, command_timeout,
+    command_runs_on_resolve_thread, command_is_read_only, coalesce_key
+)
+from .commands.cache import command_cache
+
 # Configure logging
 logger = logging.getLogger("DaVinciConnection")
 
@@ -29,96 +45,478 @@ elif platform.system() == "Linux":
     elif os.path.exists(alt_path) and alt_path not in sys.path:
         sys.path.append(alt_path)
 
-# Try to import DaVinci Resolve API directly
-try:
-    import DaVinciResolveScript as bmd
-    
-    # Get Resolve instance
-    def get_resolve_instance():
+# DaVinci Resolve scripting module, imported on the first connection attempt
+bmd = None
+
+def _load_scripting_module():
+    """Import DaVinciResolveScript once, when it is first needed"""
+    global bmd
+    if bmd is None:
         try:
-            resolve = bmd.scriptapp("Resolve")
-            if resolve:
-                logger.info("Connected to DaVinci Resolve")
-                return resolve
-            else:
-                logger.error("Failed to get Resolve instance")
-                return None
-        except Exception as e:
-            logger.error(f"Error connecting to Resolve: {str(e)}")
+            import DaVinciResolveScript
+        except ImportError as e:
+            logger.error(f"Failed to import DaVinciResolveScript: {str(e)}")
+            logger.error("Make sure DaVinci Resolve is running")
+            raise ImportError(f"Could not import DaVinci Resolve API: {str(e)}")
+        bmd = DaVinciResolveScript
+    return bmd
+
+# Get Resolve instance
+def get_resolve_instance(host=None):
+    """Connect to the Resolve on this machine, or to one on host with network scripting enabled"""
+    try:
+        script_module = _load_scripting_module()
+        resolve = script_module.scriptapp("Resolve", host) if host else script_module.scriptapp("Resolve")
+        if resolve:
+            logger.info(f"Connected to DaVinci Resolve{f' on {host}' if host else ''}")
+            return resolve
+        else:
+            logger.error("Failed to get Resolve instance")
             return None
-except ImportError as e:
-    logger.error(f"Failed to import DaVinciResolveScript: {str(e)}")
-    logger.error("Make sure DaVinci Resolve is running")
-    raise ImportError(f"Could not import DaVinci Resolve API: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error connecting to Resolve: {str(e)}")
+        return None
+
+# Global Resolve instance on this machine, set by the first successful connection
+RESOLVE_INSTANCE = None
 
-# Global Resolve instance
-RESOLVE_INSTANCE = get_resolve_instance()
-if not RESOLVE_INSTANCE:
-    logger.error("Failed to connect to DaVinci Resolve - MCP server cannot start")
-    raise ConnectionError("Could not connect to DaVinci Resolve")
+# Resolve instances the server can drive, as "name=host" pairs separated by commas;
+# a name without a host is the Resolve on this machine
+TARGETS = os.environ.get("DAVINCI_RESOLVE_MCP_TARGETS", "")
+DEFAULT_TARGET = "local"
+# Pass as target to run a read-only command on every target at once
+ALL_TARGETS = "*"
+
+# Backoff between background connection attempts, in seconds
+CONNECT_RETRY_INITIAL = 0.5
+CONNECT_RETRY_MAX = 10.0
+
+# Seconds between connection health probes; 0 turns the watchdog off
+WATCHDOG_INTERVAL = float(os.environ.get("DAVINCI_RESOLVE_MCP_WATCHDOG_INTERVAL", "5"))
+
+def _project_key(project):
+    """Identify a project handle; handles to the same project compare unequal"""
+    if not project:
+        return None
+    try:
+        return project.GetUniqueId() or project.GetName()
+    except Exception:
+        return project.GetName()
 
 @dataclass
 class DaVinciConnection:
     """Direct connection to DaVinci Resolve API"""
+    target: str = DEFAULT_TARGET
+    host: str = None
     resolve = None
     project_manager = None
     project = None
+    timeline_index: TimelineIndex = field(default_factory=TimelineIndex)
+    media_pool_index: MediaPoolIndex = field(default_factory=MediaPoolIndex)
+    changes: ChangeFeed = field(default_factory=ChangeFeed)
+    search_index: SearchIndex = field(default_factory=SearchIndex)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _connect_thread: threading.Thread = field(default=None, repr=False)
+    _watchdog_thread: threading.Thread = field(default=None, repr=False)
+    # Identical reads issued while one is queued or running share its result
+    coalescer: SingleFlight = field(default_factory=SingleFlight, repr=False)
+    _project_key: str = field(default=None, repr=False)
+    _current_timeline: str = field(default=None, repr=False)
+    _health: Dict[str, Any] = field(default_factory=lambda: {
+        "probes": 0, "project_changes": 0, "timeline_changes": 0, "disconnects": 0,
+        "last_probe_ms": None, "last_probe_age_s": None
+    }, repr=False)
+    # The scripting API is not thread-safe, so every Resolve call runs on one thread
+    _executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="DaVinciResolve"),
+        repr=False
+    )
     
     def connect(self) -> bool:
         """Connect to the DaVinci Resolve API"""
         global RESOLVE_INSTANCE
-        if RESOLVE_INSTANCE:
-            self.resolve = RESOLVE_INSTANCE
-            self.project_manager = self.resolve.GetProjectManager()
-            self.project = self.project_manager.GetCurrentProject()
-            logger.info("Connected to DaVinci Resolve API")
-            return True
+        # Reaching Resolve can take seconds; the lock is only held to publish the handles
+        if self.host:
+            instance = get_resolve_instance(self.host)
         else:
-            # Try to reconnect
-            RESOLVE_INSTANCE = get_resolve_instance()
-            if RESOLVE_INSTANCE:
-                self.resolve = RESOLVE_INSTANCE
-                self.project_manager = self.resolve.GetProjectManager()
-                self.project = self.project_manager.GetCurrentProject()
-                logger.info("Reconnected to DaVinci Resolve API")
-                return True
-            
+            instance = RESOLVE_INSTANCE or get_resolve_instance()
+        
+        if not instance:
             logger.error("Failed to connect to DaVinci Resolve")
             return False
+        
+        # Objects reached through the profiled handle are profiled too
+        resolve = profile_handle(instance, "Resolve")
+        project_manager = resolve.GetProjectManager()
+        project = project_manager.GetCurrentProject()
+        timeline = project.GetCurrentTimeline() if project else None
+        with self._lock:
+            if not self.host and not RESOLVE_INSTANCE:
+                RESOLVE_INSTANCE = instance
+            self._forget_project()
+            # Publish resolve last; tool calls treat it as "ready"
+            self.project_manager = project_manager
+            self.project = project
+            self._project_key = _project_key(project)
+            self._current_timeline = timeline.GetName() if timeline else None
+            self.resolve = resolve
+        logger.info("Connected to DaVinci Resolve API")
+        self.start_watchdog()
+        return True
+    
+    @property
+    def project_key(self) -> str:
+        """Unique ID of the open project, stable across handles and wrappers"""
+        return self._project_key
+    
+    @property
+    def connecting(self) -> bool:
+        """Whether a background connection attempt is in progress"""
+        return self._connect_thread is not None and self._connect_thread.is_alive()
+    
+    def connect_in_background(self) -> None:
+        """Start connecting on a background thread, retrying with backoff"""
+        # Checked without the lock so tool calls answer "connecting" straight away
+        if self.resolve or self.connecting:
+            return
+        with self._lock:
+            if self.resolve or self.connecting:
+                return
+            self._stop.clear()
+            self._connect_thread = threading.Thread(
+                target=self._connect_loop, name="DaVinciConnect", daemon=True
+            )
+            self._connect_thread.start()
+    
+    def _connect_loop(self) -> None:
+        delay = CONNECT_RETRY_INITIAL
+        while not self._stop.is_set() and not self.connect():
+            logger.info(f"Retrying DaVinci Resolve connection in {delay:.1f}s")
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, CONNECT_RETRY_MAX)
+    
+    def _forget_project(self) -> None:
+        """Drop every cache derived from the current project's handles"""
+        self.timeline_index.invalidate()
+        self.media_pool_index.invalidate()
+        self.changes.reset()
+        self.search_index.reset()
+        command_cache.invalidate(self)
+    
+    def start_watchdog(self) -> None:
+        """Start probing the connection in the background, once per connection object"""
+        if WATCHDOG_INTERVAL <= 0 or (self._watchdog_thread is not None and self._watchdog_thread.is_alive()):
+            return
+        self._watchdog_thread = threading.Thread(target=self._watchdog_loop, name="DaVinciWatchdog", daemon=True)
+        self._watchdog_thread.start()
+    
+    def _watchdog_loop(self) -> None:
+        while not self._stop.wait(WATCHDOG_INTERVAL):
+            if not self.resolve:
+                # The connect loop is already retrying with backoff
+                continue
+            try:
+                # Probes queue behind commands on the Resolve thread instead of racing them
+                future = self._executor.submit(self.probe)
+            except RuntimeError:
+                return
+            while not self._stop.is_set():
+                try:
+                    future.result(timeout=WATCHDOG_INTERVAL)
+                    break
+                except FutureTimeoutError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Connection probe failed: {str(e)}")
+                    break
+    
+    def probe(self) -> str:
+        """Check the handles are still live and still on the open project; call on the Resolve thread
+        
+        Returns "ok", "project_changed", "timeline_changed" or "disconnected".
+        A changed project swaps in the new handle and drops every derived
+        cache; switching or renaming the current timeline drops cached
+        answers about it; a dead Resolve clears the handles and starts
+        reconnecting with backoff.
+        """
+        global RESOLVE_INSTANCE
+        start = time.perf_counter()
+        try:
+            alive = bool(self.resolve.GetVersionString())
+            project = self.project_manager.GetCurrentProject() if alive else None
+            key = _project_key(project)
+            timeline = project.GetCurrentTimeline() if project else None
+            current_timeline = timeline.GetName() if timeline else None
+        except Exception as e:
+            logger.warning(f"Resolve handle stopped responding: {str(e)}")
+            alive = False
+        
+        self._health["probes"] += 1
+        self._health["last_probe_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        self._health["last_probe"] = time.monotonic()
+        
+        with self._lock:
+            if not alive:
+                logger.warning("Lost the connection to DaVinci Resolve, reconnecting")
+                self._health["disconnects"] += 1
+                if not self.host:
+                    RESOLVE_INSTANCE = None
+                self.resolve = None
+                self.project_manager = None
+                self.project = None
+                self._project_key = None
+                self._forget_project()
+                self.connect_in_background()
+                return "disconnected"
+            
+            if key != self._project_key:
+                logger.info(f"Current project changed to {project.GetName() if project else None}")
+                self._health["project_changes"] += 1
+                self.project = project
+                self._project_key = key
+                self._current_timeline = current_timeline
+                self._forget_project()
+                return "project_changed"
+            
+            if current_timeline != self._current_timeline:
+                # Cached results for calls without a timeline_name describe the old one
+                self._health["timeline_changes"] += 1
+                self._current_timeline = current_timeline
+                command_cache.invalidate(self)
+                return "timeline_changed"
+        return "ok"
+    
+    def health(self) -> Dict[str, Any]:
+        """Connection state and watchdog counters"""
+        health = {key: value for key, value in self._health.items() if key != "last_probe"}
+        if "last_probe" in self._health:
+            health["last_probe_age_s"] = round(time.monotonic() - self._health["last_probe"], 3)
+        return {
+            "target": self.target,
+            "host": self.host,
+            "connected": bool(self.resolve),
+            "connecting": self.connecting,
+            "project": self._project_key,
+            "watchdog_interval_s": WATCHDOG_INTERVAL,
+            **health
+        }
+    
+    def close(self) -> None:
+        """Stop background connection attempts and queued Resolve calls"""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.search_index.flush()
     
     def execute_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute a command using the DaVinci Resolve API"""
-        if not self.resolve and not self.connect():
-            raise ConnectionError("Not connected to DaVinci Resolve")
+        if not self.resolve:
+            # Never block a tool call on Resolve starting up
+            self.connect_in_background()
+            return {
+                "status": "connecting",
+                "message": "Connecting to DaVinci Resolve, please try again shortly"
+            }
             
         try:
             logger.info(f"Executing command: {command_type} with params: {params}")
             
-            # Ensure we have a current project
+            # Ensure we have a current project; switches between projects are caught by the watchdog
             if not self.project:
                 self.project = self.project_manager.GetCurrentProject()
+                self._project_key = _project_key(self.project)
+                self._forget_project()
                 
-            if not self.project and command_type != "execute_script":
+            if not self.project and command_type not in ("execute_script", "execute_script_isolated"):
                 raise Exception("No project is currently open in DaVinci Resolve")
             
-            # Import commands module directly without relative imports
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-            from src.davinci_resolve_mcp.commands import execute_command
-            return execute_command(self, command_type, params)
+            return dispatch_command(self, command_type, params)
             
         except Exception as e:
             logger.error(f"Error executing command: {str(e)}")
             raise Exception(f"Error executing command {command_type}: {str(e)}")
+    
+    async def execute_command_async(self, command_type: str, params: Dict[str, Any] = None,
+                                    timeout: float = None) -> Dict[str, Any]:
+        """Execute a command on the Resolve thread without blocking the event loop
+        
+        Cache hits and local commands are answered immediately, even while a
+        long Resolve operation is running. Commands still queued when the
+        timeout expires or the call is cancelled never start; one that is
+        already running inside Resolve cannot be interrupted. Identical
+        read-only calls made while one is in flight share its result.
+        """
+        # Validated once here; the executor functions pass bound params through as they are
+        params = bind_command(command_type, params)
+        
+        answered, result = peek_command(self, command_type, params)
+        if answered:
+            return result
+        
+        loop = asyncio.get_running_loop()
+        if not self.resolve:
+            # Starting a connection attempt takes locks, so keep it off the event loop
+            return await loop.run_in_executor(None, self.execute_command, command_type, params)
+        
+        if timeout is None:
+            timeout = command_timeout(command_type)
+        
+        # Commands that never touch our handles must not queue behind Resolve work
+        executor = self._executor if command_runs_on_resolve_thread(command_type) else None
+        start = functools.partial(loop.run_in_executor, executor, self.execute_command, command_type, params)
+        key = coalesce_key(self, command_type, params)
+        try:
+            if key is None:
+                # Reads issued during or after this command must not share a result from before it
+                self.coalescer.forget()
+                try:
+                    return await asyncio.wait_for(start(), timeout)
+                finally:
+                    self.coalescer.forget()
+            return await self.coalescer.run(key, start, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Command {command_type} timed out after {timeout}s")
+            raise TimeoutError(f"Command {command_type} timed out after {timeout}s")
+    
+    def find_timeline(self, name: str):
+        """Look up a timeline in the current project by name"""
+        if not self.project:
+            return None
+        return self.timeline_index.find(self.project, name)
+    
+    def register_timeline(self, name: str, timeline) -> None:
+        """Add a newly created timeline to the name index"""
+        if self.project:
+            self.timeline_index.add(self.project, name, timeline)
+    
+    def timeline_names(self) -> list:
+        """Return the names of every timeline in the current project"""
+        if not self.project:
+            return []
+        return self.timeline_index.names(self.project)
+    
+    def media_pool_folders(self) -> list:
+        """Return (folder path, clip count) for every media pool folder"""
+        if not self.project:
+            return []
+        return self.media_pool_index.folders(self.project)
+    
+    def media_pool_clips(self, folder: str = None) -> list:
+        """Return the clips in the media pool, or in one folder of it"""
+        if not self.project:
+            return []
+        return self.media_pool_index.clips(self.project, folder)
+    
+    def find_clip(self, name: str = None, path: str = None, uid: str = None):
+        """Look up a media pool clip by unique ID, file path or name"""
+        if not self.project:
+            return None
+        return self.media_pool_index.find(self.project, name=name, path=path, uid=uid)
+    
+    def find_clips(self, references, validate: bool = False) -> dict:
+        """Look up many media pool clips at once, keyed by the unique ID, file path or name given"""
+        if not self.project:
+            return {}
+        return self.media_pool_index.find_many(self.project, references, validate)
+    
+    def invalidate_media_folder(self, folder=None) -> None:
+        """Mark a media pool folder as changed, or the whole pool if none is given"""
+        self.media_pool_index.mark_dirty(folder)
+    
+    def record_change(self, command_type: str, params: Dict[str, Any] = None, finished: bool = False) -> None:
+        """Tell the change feed, search index and media pool index that a mutating command ran"""
+        self.changes.mark(command_type, params, finished)
+        self.search_index.mark(command_type, params)
+        if command_type in BROAD_COMMANDS:
+            # Scripts can rename timelines and import, move or delete clips anywhere in the pool
+            self.timeline_index.mark_dirty()
+            self.media_pool_index.mark_dirty()
 
-# Global connection instance
+def parse_targets(spec):
+    """Turn "name=host,name2=host2" into {name: host}; the local Resolve has host None"""
+    targets = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, host = entry.partition("=")
+        name = name.strip()
+        if not name or name == ALL_TARGETS:
+            raise ValueError(f"Invalid target name in DAVINCI_RESOLVE_MCP_TARGETS: {entry!r}")
+        targets[name] = host.strip() or None
+    return targets or {DEFAULT_TARGET: None}
+
+class ConnectionPool:
+    """One connection, with its own Resolve thread, per configured Resolve instance"""
+    
+    def __init__(self, targets=None):
+        self.targets = dict(targets or {DEFAULT_TARGET: None})
+        # The first target answers calls that do not name one
+        self.default = next(iter(self.targets))
+        self._connections = {}
+        self._lock = threading.Lock()
+    
+    def names(self) -> list:
+        return list(self.targets)
+    
+    def get(self, target: str = None) -> DaVinciConnection:
+        """Return the connection for a target, starting to connect it on first use"""
+        name = target or self.default
+        if name not in self.targets:
+            raise Exception(f"Unknown target '{name}'; configured targets: {', '.join(self.targets)}")
+        with self._lock:
+            connection = self._connections.get(name)
+            if connection is None:
+                connection = self._connections[name] = DaVinciConnection(target=name, host=self.targets[name])
+                connection.connect_in_background()
+        return connection
+    
+    async def execute_command_async(self, command_type: str, params: Dict[str, Any] = None,
+                                    target: str = None) -> Dict[str, Any]:
+        """Run a command on one target, or a read-only command on every target concurrently"""
+        if target != ALL_TARGETS:
+            return await self.get(target).execute_command_async(command_type, params)
+        
+        if not command_is_read_only(command_type):
+            raise Exception(f"{command_type} is not read-only and cannot run on every target at once")
+        names = self.names()
+        # Each target has its own Resolve thread, so the calls overlap
+        results = await asyncio.gather(
+            *(self.get(name).execute_command_async(command_type, params) for name in names),
+            return_exceptions=True
+        )
+        return {
+            "targets": {
+                name: {"status": "error", "message": str(result)} if isinstance(result, Exception) else result
+                for name, result in zip(names, results)
+            }
+        }
+    
+    def connections(self) -> list:
+        with self._lock:
+            return list(self._connections.values())
+    
+    def close(self) -> None:
+        for connection in self.connections():
+            connection.close()
+
+# Global connection pool and the default target's connection
+connection_pool = None
 davinci_connection = None
 
-def get_davinci_connection():
-    """Get or create the DaVinci connection"""
+def get_connection_pool() -> ConnectionPool:
+    """Get or create the pool of connections to the configured targets"""
+    global connection_pool
+    
+    if not connection_pool:
+        connection_pool = ConnectionPool(parse_targets(TARGETS))
+    
+    return connection_pool
+
+def get_davinci_connection(target: str = None):
+    """Get or create the connection to a target, by default the first configured one"""
     global davinci_connection
     
-    if not davinci_connection:
-        davinci_connection = DaVinciConnection()
-        davinci_connection.connect()
+    connection = get_connection_pool().get(target)
+    if not target and not davinci_connection:
+        davinci_connection = connection
     
-    return davinci_connection 
\ No newline at end of file
+    return connection
@@ -0,0 +1,309 @@
+"""
+In-process lookup indexes over DaVinci Resolve objects.
+
+Every call into the Resolve scripting API crosses an IPC boundary, so these
+indexes keep name -> handle maps on the connection and only go back to Resolve
+when an entry looks stale.
+"""
+import logging
+
+# Configure logging
+logger = logging.getLogger("DaVinciIndexes")
+
+
+class TimelineIndex:
+    """Lazily built timeline name -> (index, handle) map for one project"""
+
+    def __init__(self):
+        self._project = None
+        self._timelines = None
+        self._count = 0
+        self._dirty = False
+
+    def invalidate(self):
+        """Drop the index so the next lookup rebuilds it"""
+        self._project = None
+        self._timelines = None
+        self._count = 0
+        self._dirty = False
+
+    def mark_dirty(self):
+        """Re-read names on the next miss, e.g. after a script that may have renamed timelines"""
+        self._dirty = True
+
+    def _build(self, project):
+        """Scan every timeline in the project once"""
+        count = project.GetTimelineCount() or 0
+        timelines = {}
+        for i in range(1, count + 1):  # API indexes start at 1
+            timeline = project.GetTimelineByIndex(i)
+            if timeline:
+                timelines.setdefault(timeline.GetName(), (i, timeline))
+
+        self._project = project
+        self._timelines = timelines
+        self._count = count
+        self._dirty = False
+        logger.debug(f"Built timeline index with {len(timelines)} timelines")
+
+    def _ensure(self, project) -> bool:
+        """Build the index if it is missing or belongs to another project"""
+        if self._timelines is None or self._project is not project:
+            self._build(project)
+            return True
+        return False
+
+    def find(self, project, name):
+        """Return the timeline called name, or None if the project has none"""
+        fresh = self._ensure(project)
+        entry = self._timelines.get(name)
+
+        if entry is not None:
+            # One call to confirm the handle was not renamed or deleted
+            try:
+                if entry[1].GetName() == name:
+                    return entry[1]
+            except Exception:
+                pass
+        elif fresh or (not self._dirty and project.GetTimelineCount() == self._count):
+            # Names are re-read by names() and after stale hits; a miss alone costs one call
+            return None
+
+        # The stale hit, count change or mutation means timelines changed since the index was read
+        self._refresh(project)
+        entry = self._timelines.get(name)
+        return entry[1] if entry else None
+
+    def _refresh(self, project):
+        """Re-read every timeline's name through its cached handle, one call each
+
+        Falls back to a full scan when timelines were added or deleted.
+        """
+        if project.GetTimelineCount() != self._count or len(self._timelines) != self._count:
+            # Duplicate names hide handles from the index; only a full scan sees them
+            self._build(project)
+            return
+        timelines = {}
+        for index, timeline in sorted(self._timelines.values(), key=lambda entry: entry[0]):
+            try:
+                name = timeline.GetName()
+            except Exception:
+                name = None
+            if not name or name in timelines:
+                self._build(project)
+                return
+            timelines[name] = (index, timeline)
+        self._timelines = timelines
+        self._dirty = False
+
+    def names(self, project) -> list:
+        """Return timeline names in project order, read live so renames made in Resolve show up"""
+        if not self._ensure(project):
+            self._refresh(project)
+        return [name for name, _ in sorted(self._timelines.items(), key=lambda item: item[1][0])]
+
+    def add(self, project, name, timeline):
+        """Record a timeline this server just created"""
+        if self._timelines is None or self._project is not project:
+            # Not built yet; the next lookup will pick the timeline up
+            return
+        self._count += 1
+        self._timelines.setdefault(name, (self._count, timeline))
+
+
+class MediaPoolIndex:
+    """Media pool clip index by name, file path and unique ID for one project
+
+    Clips are indexed per folder. A refresh walks the folder tree with one
+    GetClipList/GetSubFolderList pair per folder and only re-reads the clips of
+    folders whose clip count changed or that were marked dirty.
+    """
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the index so the next lookup rebuilds it"""
+        self._project = None
+        self._media_pool = None
+        self._folders = {}
+        self._by_name = {}
+        self._by_path = {}
+        self._by_uid = {}
+        self._dirty = set()
+        self._stale_tree = False
+
+    def mark_dirty(self, folder=None):
+        """Re-read a folder's clips on the next lookup, or rescan all folders"""
+        for path, entry in self._folders.items():
+            if folder is not None and entry["folder"] == folder:
+                self._dirty.add(path)
+                return
+        # Unknown or new folder; walk the tree again on the next lookup
+        self._stale_tree = True
+
+    def _forget(self, path):
+        """Remove one folder's clips from the lookup maps"""
+        entry = self._folders.pop(path, None)
+        if not entry:
+            return
+        for clip in entry["clips"]:
+            same_name = self._by_name.get(clip["name"], [])
+            if clip in same_name:
+                same_name.remove(clip)
+                if not same_name:
+                    del self._by_name[clip["name"]]
+            if self._by_path.get(clip["path"]) is clip:
+                del self._by_path[clip["path"]]
+            if self._by_uid.get(clip["uid"]) is clip:
+                del self._by_uid[clip["uid"]]
+
+    def _read_folder(self, path, folder, items=None):
+        """(Re)index the clips of one folder"""
+        self._forget(path)
+        if items is None:
+            items = folder.GetClipList() or []
+        clips = []
+        for item in items:
+            # One call for every property instead of one per property
+            properties = item.GetClipProperty() or {}
+            clip = {
+                "name": properties.get("Clip Name") or item.GetName(),
+                "path": properties.get("File Path") or None,
+                "uid": item.GetUniqueId(),
+                "folder": path,
+                "item": item
+            }
+            clips.append(clip)
+            self._by_name.setdefault(clip["name"], []).append(clip)
+            if clip["path"]:
+                self._by_path.setdefault(clip["path"], clip)
+            self._by_uid[clip["uid"]] = clip
+        self._folders[path] = {"folder": folder, "count": len(items), "clips": clips}
+
+    def _refresh(self):
+        """Walk the folder tree and re-read folders that changed"""
+        seen = set()
+        stack = [(None, self._media_pool.GetRootFolder())]
+        while stack:
+            parent, folder = stack.pop()
+            path = f"{parent}/{folder.GetName()}" if parent else folder.GetName()
+            seen.add(path)
+            items = folder.GetClipList() or []
+            known = self._folders.get(path)
+            if known is None or known["count"] != len(items) or path in self._dirty:
+                self._read_folder(path, folder, items)
+            else:
+                known["folder"] = folder
+            stack.extend((path, subfolder) for subfolder in folder.GetSubFolderList() or [])
+
+        for path in list(self._folders):
+            if path not in seen:
+                self._forget(path)
+        self._dirty.clear()
+        self._stale_tree = False
+        logger.debug(f"Refreshed media pool index: {len(self._by_uid)} clips in {len(self._folders)} folders")
+
+    def _ensure(self, project) -> bool:
+        """Bring the index up to date, returning True if it walked the tree"""
+        if self._project is not project:
+            self.invalidate()
+            self._project = project
+            self._media_pool = project.GetMediaPool()
+            self._refresh()
+            return True
+        if self._stale_tree:
+            self._refresh()
+            return True
+        for path in list(self._dirty):
+            entry = self._folders.get(path)
+            if entry:
+                self._read_folder(path, entry["folder"])
+        self._dirty.clear()
+        return False
+
+    def _check_counts(self):
+        """Re-read folders whose clip count changed, one GetClipList per folder
+
+        Catches clips added or removed outside this server, e.g. in the
+        Resolve UI, without walking the folder tree again.
+        """
+        for path, entry in list(self._folders.items()):
+            items = entry["folder"].GetClipList() or []
+            if len(items) != entry["count"]:
+                self._read_folder(path, entry["folder"], items)
+
+    def find_many(self, project, references, validate=False) -> dict:
+        """Resolve many clip references (unique ID, file path or name) with at most one rescan of the pool
+
+        Hits are returned without a call per clip. Pass validate=True once
+        Resolve has rejected a handle to confirm every hit and re-read the
+        folders holding stale ones.
+        """
+        fresh = self._ensure(project)
+        found = {reference: self._match(reference) for reference in set(references)}
+        stale = {clip["folder"] for clip in found.values() if validate and clip is not None and not self._valid(clip)}
+        if stale or (not fresh and None in found.values()):
+            # A miss or stale hit means the pool changed outside this server
+            self._dirty.update(stale)
+            self._refresh()
+            found = {reference: self._match(reference) for reference in found}
+        return {reference: clip["item"] for reference, clip in found.items() if clip is not None}
+
+    def _match(self, reference):
+        matches = self._by_name.get(reference)
+        return self._by_uid.get(reference) or self._by_path.get(reference) or (matches[0] if matches else None)
+
+    @staticmethod
+    def _valid(clip):
+        try:
+            return clip["item"].GetUniqueId() == clip["uid"]
+        except Exception:
+            return False
+
+    def _lookup(self, name=None, path=None, uid=None):
+        if uid:
+            return self._by_uid.get(uid)
+        if path:
+            return self._by_path.get(path)
+        matches = self._by_name.get(name)
+        return matches[0] if matches else None
+
+    def find(self, project, name=None, path=None, uid=None):
+        """Return the MediaPoolItem matching uid, path or name, or None"""
+        fresh = self._ensure(project)
+        clip = self._lookup(name, path, uid)
+        if clip is not None:
+            # One call to confirm the handle still points at the same clip
+            try:
+                if clip["item"].GetUniqueId() == clip["uid"]:
+                    return clip["item"]
+            except Exception:
+                pass
+        elif fresh:
+            return None
+
+        # The miss or stale hit means the pool changed outside this server
+        self._refresh()
+        clip = self._lookup(name, path, uid)
+        return clip["item"] if clip else None
+
+    def folders(self, project) -> list:
+        """Return (folder path, clip count) for every indexed folder"""
+        if not self._ensure(project):
+            self._check_counts()
+        return [(path, entry["count"]) for path, entry in self._folders.items()]
+
+    def clips(self, project, folder=None) -> list:
+        """Return indexed clips as name/path/uid/folder dicts"""
+        if not self._ensure(project):
+            self._check_counts()
+        if folder:
+            folders = [self._folders[folder]] if folder in self._folders else []
+        else:
+            folders = self._folders.values()
+        return [
+            {key: clip[key] for key in ("name", "path", "uid", "folder")}
+            for entry in folders
+            for clip in entry["clips"]
+        ]
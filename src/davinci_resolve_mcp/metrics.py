@@ -0,0 +1,290 @@
+"""
+Latency and Resolve API call accounting for the MCP server.
+
+ApiProxy wraps the scripting handles held by the connection and times every
+method call made through them, including calls on the objects they return.
+The executor records each command's latency; API calls made while a command
+runs are attributed to it.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Configure logging
+logger = logging.getLogger("DaVinciMetrics")
+
+# Set DAVINCI_RESOLVE_MCP_API_PROFILING=0 to hand out the raw scripting handles
+API_PROFILING = os.environ.get("DAVINCI_RESOLVE_MCP_API_PROFILING", "1") != "0"
+
+# Latency samples kept per command for percentiles
+MAX_SAMPLES = 2048
+
+# Object kind returned by each scripting method, used to label API calls
+RETURN_KINDS = {
+    "GetProjectManager": "ProjectManager",
+    "GetCurrentProject": "Project",
+    "LoadProject": "Project",
+    "CreateProject": "Project",
+    "GetMediaPool": "MediaPool",
+    "GetCurrentTimeline": "Timeline",
+    "GetTimelineByIndex": "Timeline",
+    "CreateEmptyTimeline": "Timeline",
+    "CreateTimelineFromClips": "Timeline",
+    "ImportTimelineFromFile": "Timeline",
+    "GetRootFolder": "Folder",
+    "GetCurrentFolder": "Folder",
+    "GetSubFolderList": "Folder",
+    "AddSubFolder": "Folder",
+    "GetClipList": "MediaPoolItem",
+    "ImportMedia": "MediaPoolItem",
+    "GetMediaPoolItem": "MediaPoolItem",
+    "GetItemListInTrack": "TimelineItem",
+    "AppendToTimeline": "TimelineItem",
+}
+
+_PRIMITIVES = (str, int, float, bool, bytes, type(None))
+
+
+def _unwrap(value):
+    """Replace proxies with the raw handles before they go back to Resolve"""
+    if isinstance(value, ApiProxy):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+def _wrap(value, kind, recorder):
+    """Wrap scripting objects in a result so calls on them are counted too"""
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, list):
+        return [_wrap(item, kind, recorder) for item in value]
+    if isinstance(value, dict):
+        return {key: _wrap(item, kind, recorder) for key, item in value.items()}
+    return ApiProxy(value, kind, recorder)
+
+
+class ApiProxy:
+    """Transparent wrapper that counts and times scripting API method calls"""
+    __slots__ = ("_target", "_kind", "_recorder")
+
+    def __init__(self, target, kind, recorder):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_kind", kind)
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        label = f"{self._kind}.{name}"
+        kind = RETURN_KINDS.get(name, "Object")
+        recorder = self._recorder
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attr(*_unwrap(args), **_unwrap(kwargs))
+            finally:
+                recorder.record_api(label, time.perf_counter() - start)
+            return _wrap(result, kind, recorder)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __bool__(self):
+        return bool(self._target)
+
+    def __repr__(self):
+        return f"ApiProxy({self._target!r})"
+
+
+def profile_handle(handle, kind, recorder=None):
+    """Wrap a scripting handle for profiling if it is enabled"""
+    if handle is None or not API_PROFILING or isinstance(handle, ApiProxy):
+        return handle
+    return ApiProxy(handle, kind, recorder or metrics)
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    rank = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class _CommandStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.api_calls = 0
+        self.api_seconds = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "p50_ms": _ms(_percentile(ordered, 0.50)),
+            "p95_ms": _ms(_percentile(ordered, 0.95)),
+            "p99_ms": _ms(_percentile(ordered, 0.99)),
+            "api_calls": self.api_calls,
+            "api_calls_per_call": round(self.api_calls / self.count, 2) if self.count else None,
+            "api_ms": _ms(self.api_seconds)
+        }
+
+
+class _Frame:
+    __slots__ = ("api_calls", "api_seconds")
+
+    def __init__(self):
+        self.api_calls = 0
+        self.api_seconds = 0.0
+
+
+class Metrics:
+    """Per-command latency and per-method API call counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Clear every counter"""
+        with self._lock:
+            self._commands = {}
+            self._api = {}
+            self._started = time.time()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_api(self, label, seconds):
+        """Count one scripting API call against the commands running on this thread"""
+        for frame in self._stack():
+            frame.api_calls += 1
+            frame.api_seconds += seconds
+        with self._lock:
+            entry = self._api.get(label)
+            if entry is None:
+                entry = self._api[label] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def track(self, command_type):
+        """Time a command and attribute the API calls it makes to it"""
+        frame = _Frame()
+        stack = self._stack()
+        stack.append(frame)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self.record_command(command_type, elapsed, failed, frame.api_calls, frame.api_seconds)
+
+    clock = staticmethod(time.perf_counter)
+
+    def record_command(self, command_type, seconds, failed=False, api_calls=0, api_seconds=0.0):
+        """Record one finished command"""
+        with self._lock:
+            stats = self._commands.get(command_type)
+            if stats is None:
+                stats = self._commands[command_type] = _CommandStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total += seconds
+            stats.samples.append(seconds)
+            stats.api_calls += api_calls
+            stats.api_seconds += api_seconds
+
+    def snapshot(self, top_api=25):
+        """Return command percentiles and the busiest API methods"""
+        with self._lock:
+            commands = {name: stats.summary() for name, stats in sorted(self._commands.items())}
+            api = sorted(self._api.items(), key=lambda item: item[1][0], reverse=True)
+            return {
+                "since": self._started,
+                "commands": commands,
+                "api_calls_total": sum(count for count, _ in self._api.values()),
+                "api_methods": {
+                    label: {"count": count, "total_ms": _ms(seconds)}
+                    for label, (count, seconds) in api[:top_api]
+                }
+            }
+
+    def prometheus(self):
+        """Render the counters in the Prometheus text exposition format"""
+        snapshot = self.snapshot(top_api=None)
+        lines = [
+            "# HELP davinci_command_latency_seconds Command latency as seen by the executor",
+            "# TYPE davinci_command_latency_seconds summary"
+        ]
+        for name, stats in snapshot["commands"].items():
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                if stats[key] is not None:
+                    lines.append(f'davinci_command_latency_seconds{{command="{name}",quantile="{quantile}"}} {stats[key] / 1000}')
+            lines.append(f'davinci_command_latency_seconds_count{{command="{name}"}} {stats["count"]}')
+            lines.append(f'davinci_command_latency_seconds_sum{{command="{name}"}} {(stats["mean_ms"] or 0) * stats["count"] / 1000}')
+        lines += [
+            "# HELP davinci_command_api_calls_total Resolve API calls made by each command",
+            "# TYPE davinci_command_api_calls_total counter"
+        ]
+        for name, stats in snapshot["commands"].items():
+            lines.append(f'davinci_command_api_calls_total{{command="{name}"}} {stats["api_calls"]}')
+        lines += [
+            "# HELP davinci_api_calls_total Calls per Resolve scripting API method",
+            "# TYPE davinci_api_calls_total counter"
+        ]
+        for label, entry in snapshot["api_methods"].items():
+            lines.append(f'davinci_api_calls_total{{method="{label}"}} {entry["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump_jsonl(self, path):
+        """Append one JSON line per command to path for offline analysis"""
+        snapshot = self.snapshot(top_api=None)
+        now = time.time()
+        with open(path, "a", encoding="utf-8") as handle:
+            for name, stats in snapshot["commands"].items():
+                handle.write(json.dumps({"time": now, "command": name, **stats}) + "\n")
+            handle.write(json.dumps({"time": now, "api_methods": snapshot["api_methods"]}) + "\n")
+        return len(snapshot["commands"]) + 1
+
+
+# Shared metrics for the server process
+metrics = Metrics()
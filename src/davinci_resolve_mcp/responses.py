@@ -0,0 +1,186 @@
+"""
+Encoding of command results into tool responses.
+
+Responses are compact JSON by default and use orjson when it is installed.
+A response longer than the size budget is cut down to fit: the largest list in
+the result is paginated and the rest is kept under a continuation token that
+the get_response_page tool hands out page by page. Results with no list to
+split are returned as text in chunks the same way.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger("DaVinciResponses")
+
+# Set DAVINCI_RESOLVE_MCP_PRETTY_JSON=1 to indent responses for reading by eye
+PRETTY_JSON = os.environ.get("DAVINCI_RESOLVE_MCP_PRETTY_JSON", "0") == "1"
+
+# Set DAVINCI_RESOLVE_MCP_ORJSON=0 to use the standard library encoder even if orjson is installed
+USE_ORJSON = orjson is not None and os.environ.get("DAVINCI_RESOLVE_MCP_ORJSON", "1") != "0"
+
+# Longest response in characters before it is paginated; 0 turns the budget off
+MAX_RESPONSE_CHARS = int(os.environ.get("DAVINCI_RESOLVE_MCP_MAX_RESPONSE_CHARS", "100000"))
+
+# Room kept for the continuation block added to a paginated response
+_CONTINUATION_OVERHEAD = 200
+
+# How long and how many unread remainders are kept
+CONTINUATION_TTL = 600.0
+MAX_CONTINUATIONS = 32
+
+# How deep into nested dicts to look for a list to paginate
+_MAX_LIST_DEPTH = 4
+
+
+def dumps(value, pretty=None) -> str:
+    """Serialize a result to JSON, compact unless pretty is requested"""
+    pretty = PRETTY_JSON if pretty is None else pretty
+    if USE_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(value, default=str, option=option).decode("utf-8")
+        except TypeError:
+            # orjson is stricter about some inputs (e.g. ints over 64 bits); fall back
+            pass
+    if pretty:
+        return json.dumps(value, indent=2, default=str, ensure_ascii=False)
+    return json.dumps(value, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+class ContinuationStore:
+    """Remainders of paginated responses, by token, with TTL and LRU eviction"""
+
+    def __init__(self, ttl=CONTINUATION_TTL, max_entries=MAX_CONTINUATIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, remainder) -> str:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._entries[token] = (time.monotonic() + self.ttl, remainder)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def pop(self, token):
+        """Return and forget the remainder for a token, or None if it expired"""
+        with self._lock:
+            entry = self._entries.pop(token, None)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+
+# Shared store for the server process
+continuations = ContinuationStore()
+
+
+def _largest_list(value, path=(), depth=0):
+    """Return (encoded size, path) of the biggest list reachable through dict keys"""
+    best = None
+    if isinstance(value, list) and len(value) > 1:
+        best = (len(dumps(value, pretty=False)), path)
+    elif isinstance(value, dict) and depth < _MAX_LIST_DEPTH:
+        for key, item in value.items():
+            found = _largest_list(item, path + (key,), depth + 1)
+            if found and (best is None or found[0] > best[0]):
+                best = found
+    return best
+
+
+def _get(value, path):
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _replace(value, path, items):
+    """Copy of value with the list at path replaced; only the dicts on the path are copied"""
+    if not path:
+        return items
+    copy = dict(value)
+    copy[path[0]] = _replace(value[path[0]], path[1:], items)
+    return copy
+
+
+def _paginate(result, budget):
+    """Cut the largest list in result down until the response fits the budget"""
+    found = _largest_list(result)
+    if found:
+        path = found[1]
+        items = _get(result, path)
+        limit = budget - _CONTINUATION_OVERHEAD
+        # Binary search for the most items that fit; the whole list is known not to
+        low, high = 0, len(items) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if len(dumps(_replace(result, path, items[:middle]))) <= limit:
+                low = middle
+            else:
+                high = middle - 1
+        page = _replace(result, path, items[:low])
+        if low and len(dumps(page)) <= limit:
+            token = continuations.put({"result": result, "path": path, "offset": low})
+            page["continuation"] = {
+                "token": token,
+                "path": ".".join(str(key) for key in path),
+                "returned": low,
+                "remaining": len(items) - low
+            }
+            return page
+
+    # Nothing to paginate; hand out the encoded text in chunks
+    return _text_page(dumps(result), budget)
+
+
+def _text_page(text, budget):
+    """First chunk of text that fits the budget once escaped, plus a token for the rest"""
+    limit = max(budget - _CONTINUATION_OVERHEAD, 1)
+    size = min(limit, len(text))
+    # Quotes and backslashes grow when the chunk is escaped into a JSON string
+    while size > 1 and len(dumps(text[:size])) > limit:
+        size = max(1, size * limit // len(dumps(text[:size])) - 1)
+    page = {"text": text[:size]}
+    if size < len(text):
+        page["continuation"] = {
+            "token": continuations.put({"text": text[size:]}),
+            "returned_chars": size,
+            "remaining_chars": len(text) - size
+        }
+    return page
+
+
+def encode_response(result, budget=None) -> str:
+    """Serialize a command result for a tool response, paginating past the size budget"""
+    budget = MAX_RESPONSE_CHARS if budget is None else budget
+    text = dumps(result)
+    if not budget or len(text) <= budget:
+        return text
+    if not isinstance(result, dict):
+        result = {"result": result}
+    logger.info(f"Response of {len(text)} characters exceeds the {budget} character budget, paginating")
+    return dumps(_paginate(result, budget))
+
+
+def next_page(token, budget=None):
+    """Return what is left of a paginated response, to be encoded again"""
+    remainder = continuations.pop(token)
+    if remainder is None:
+        raise Exception("Unknown or expired continuation token")
+    if "text" in remainder:
+        return _text_page(remainder["text"], MAX_RESPONSE_CHARS if budget is None else budget)
+    result, path = remainder["result"], remainder["path"]
+    return _replace(result, path, _get(result, path)[remainder["offset"]:])
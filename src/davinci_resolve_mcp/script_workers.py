@@ -0,0 +1,329 @@
+"""
+Pool of subprocesses that run agent scripts away from the server process.
+
+Each worker opens its own scripting connection to Resolve, runs one script at
+a time and streams what the script prints back over a pipe before sending the
+result. A script that runs past its wall-clock limit is killed with its
+worker. Each worker caps its address space so an allocation past the memory
+limit fails inside the script; a thread watching peak RSS stops the worker
+if memory grows some other way.
+Workers are replaced after a fixed number of runs so leaks cannot build up.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger("DaVinciScriptWorkers")
+
+# Worker processes kept ready, runs before a worker is replaced, and its memory limit
+POOL_SIZE = int(os.environ.get("DAVINCI_RESOLVE_MCP_SCRIPT_WORKERS", "2"))
+MAX_RUNS_PER_WORKER = int(os.environ.get("DAVINCI_RESOLVE_MCP_SCRIPT_MAX_RUNS", "100"))
+MAX_RSS_MB = int(os.environ.get("DAVINCI_RESOLVE_MCP_SCRIPT_MAX_RSS_MB", "1024"))
+
+# Printed output kept per run; anything beyond it is dropped
+MAX_OUTPUT_CHARS = 64 * 1024
+
+# Seconds to wait for a worker to start and connect to Resolve
+START_TIMEOUT = 30.0
+
+_RSS_CHECK_INTERVAL = 0.1
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _limit_address_space(max_rss_mb):
+    """Cap this process's address space at its current size plus max_rss_mb"""
+    try:
+        import resource
+        with open("/proc/self/status", encoding="ascii") as handle:
+            status = dict(line.split(":", 1) for line in handle if ":" in line)
+        size_kb = int(status["VmSize"].split()[0])
+    except (ImportError, OSError, KeyError, ValueError):
+        # No RLIMIT_AS or no /proc here; the RSS watcher still applies
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = (size_kb + max_rss_mb * 1024) * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not limit script worker memory: {str(e)}")
+
+
+class _PipeWriter(io.TextIOBase):
+    """stdout replacement that forwards printed text to the server as it is written"""
+
+    def __init__(self, send):
+        self._send = send
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self._send(("output", text))
+        return len(text)
+
+
+def _watch_memory(send, max_rss_mb):
+    """Report and exit as soon as the worker's peak RSS passes the limit
+
+    Backstop for the address-space limit, which not every platform enforces.
+    """
+    while True:
+        rss = _peak_rss_mb()
+        if rss is not None and rss > max_rss_mb:
+            try:
+                send(("exit", {
+                    "status": "error",
+                    "message": f"Script exceeded the memory limit of {max_rss_mb} MB (peak RSS {rss:.0f} MB)"
+                }))
+            finally:
+                os._exit(1)
+        time.sleep(_RSS_CHECK_INTERVAL)
+
+
+def _worker_main(conn, max_runs, max_rss_mb):
+    """Entry point of a worker process"""
+    from .connection import get_resolve_instance
+
+    # The memory watchdog sends from its own thread; keep messages whole
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    resolve = get_resolve_instance()
+    send(("ready", {"pid": os.getpid(), "connected": bool(resolve)}))
+    if max_rss_mb:
+        threading.Thread(target=_watch_memory, args=(send, max_rss_mb), daemon=True).start()
+        # Set once the connection and watcher exist so their own mappings count as the base
+        _limit_address_space(max_rss_mb)
+
+    stdout = sys.stdout
+    for _ in range(max_runs):
+        try:
+            code = conn.recv()
+        except EOFError:
+            return
+        if code is None:
+            return
+
+        project_manager = resolve.GetProjectManager() if resolve else None
+        namespace = {
+            "resolve": resolve,
+            "project_manager": project_manager,
+            "project": project_manager.GetCurrentProject() if project_manager else None,
+            "result": None
+        }
+        sys.stdout = _PipeWriter(send)
+        try:
+            exec(compile(code, "<execute_script_isolated>", "exec"), namespace)
+            response = {"status": "success", "result": namespace.get("result", "Script executed successfully")}
+        except MemoryError:
+            namespace.clear()
+            sys.stdout = stdout
+            send(("exit", {
+                "status": "error",
+                "message": f"Script exceeded the memory limit of {max_rss_mb} MB"
+            }))
+            return
+        except Exception as e:
+            response = {"status": "error", "message": f"Script execution error: {str(e)}"}
+        finally:
+            sys.stdout = stdout
+
+        try:
+            pickle.dumps(response)
+        except Exception:
+            response["result"] = repr(response.get("result"))
+        response["peak_rss_mb"] = _peak_rss_mb()
+        send(("done", response))
+
+
+class _Worker:
+    """Server-side handle on one worker process"""
+
+    def __init__(self, context, max_runs, max_rss_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, max_runs, max_rss_mb),
+            name="DaVinciScriptWorker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.runs_left = max_runs
+        self.connected = None
+
+    def wait_ready(self, timeout):
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Script worker did not start within {timeout}s")
+        _, info = self.conn.recv()
+        self.connected = info["connected"]
+
+    @property
+    def alive(self):
+        return self.process.is_alive() and self.runs_left > 0
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ScriptWorkerPool:
+    """Fixed-size pool of script worker processes, started on first use"""
+
+    def __init__(self, size=POOL_SIZE, max_runs=MAX_RUNS_PER_WORKER, max_rss_mb=MAX_RSS_MB):
+        self.size = size
+        self.max_runs = max_runs
+        self.max_rss_mb = max_rss_mb
+        # Spawned workers start from a clean interpreter with their own Resolve connection
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self.runs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    def _acquire(self, timeout):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No script worker became free within {timeout}s")
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker.alive:
+                return worker
+            self._retire(worker)
+        worker = None
+        try:
+            worker = _Worker(self._context, self.max_runs, self.max_rss_mb)
+            with self._lock:
+                self._workers.add(worker)
+            worker.wait_ready(START_TIMEOUT)
+            return worker
+        except Exception:
+            if worker:
+                self._retire(worker)
+            self._slots.release()
+            raise
+
+    def _release(self, worker):
+        if worker.alive:
+            self._idle.put(worker)
+        else:
+            if worker.runs_left <= 0:
+                self.recycled += 1
+            self._retire(worker)
+        self._slots.release()
+
+    def _retire(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def run(self, code, timeout):
+        """Run code in a worker and return its result, printed output and timing"""
+        start = time.monotonic()
+        worker = self._acquire(timeout)
+        deadline = start + timeout
+        output, output_chars = [], 0
+        response = None
+        try:
+            worker.runs_left -= 1
+            try:
+                worker.conn.send(code)
+            except OSError:
+                self.crashes += 1
+                worker.kill()
+                response = {"status": "error", "message": "Script worker exited before the script was sent"}
+            while response is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    self.timeouts += 1
+                    worker.kill()
+                    response = {"status": "error", "message": f"Script timed out after {timeout}s and was killed"}
+                    break
+                try:
+                    kind, payload = worker.conn.recv()
+                except EOFError:
+                    self.crashes += 1
+                    response = {"status": "error", "message": "Script worker exited before returning a result"}
+                    break
+                if kind == "output":
+                    if output_chars < MAX_OUTPUT_CHARS:
+                        output.append(payload[:MAX_OUTPUT_CHARS - output_chars])
+                    output_chars += len(payload)
+                elif kind == "done":
+                    response = payload
+                elif kind == "exit":
+                    # The worker is on its way out; do not hand it another script
+                    worker.kill()
+                    response = payload
+        finally:
+            self.runs += 1
+            self._release(worker)
+
+        response["output"] = "".join(output)
+        if output_chars > MAX_OUTPUT_CHARS:
+            response["output_truncated"] = output_chars - MAX_OUTPUT_CHARS
+        response["worker_pid"] = worker.process.pid
+        response["connected"] = worker.connected
+        response["ms"] = round((time.monotonic() - start) * 1000, 2)
+        return response
+
+    def stats(self):
+        with self._lock:
+            live = sum(1 for worker in self._workers if worker.process.is_alive())
+        return {
+            "size": self.size,
+            "live_workers": live,
+            "idle_workers": self._idle.qsize(),
+            "max_runs_per_worker": self.max_runs,
+            "max_rss_mb": self.max_rss_mb,
+            "runs": self.runs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled
+        }
+
+    def close(self):
+        """Stop every worker process"""
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(0.5)
+            worker.kill()
+
+
+# Shared pool for the server process
+script_workers = ScriptWorkerPool()
@@ -0,0 +1,415 @@
+"""
+Inverted index over the open project for search_project.
+
+Documents are timelines, timeline items, markers and media pool clips. The
+documents of each timeline form one segment, stored with a cheap signature:
+duration, item count per track and marker count. Mutating commands mark the
+timelines they touched and the next search re-walks only those. The index is
+saved to a cache file keyed by project; after a restart it is loaded from
+there and each timeline's signature is checked, so only timelines that
+changed while the server was down are walked again.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .change_feed import BROAD_COMMANDS, CURRENT_TIMELINE, NON_EDITING_COMMANDS
+from .commands.timeline_info import TRACK_TYPES
+
+# Configure logging
+logger = logging.getLogger("DaVinciSearchIndex")
+
+# Where search indexes are saved between runs; set to an empty string to keep them in memory only
+CACHE_DIR = os.environ.get(
+    "DAVINCI_RESOLVE_MCP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "davinci-resolve-mcp")
+)
+# Bump when the saved layout changes so old files are rebuilt
+CACHE_FORMAT = 1
+# Seconds between cache file writes; later changes wait for the next update or close
+SAVE_INTERVAL = float(os.environ.get("DAVINCI_RESOLVE_MCP_SEARCH_SAVE_INTERVAL", "30"))
+
+DOCUMENT_KINDS = ("timeline", "clip", "item", "marker")
+
+# Commands that only touch markers; their timelines have just their markers read again
+MARKER_COMMANDS = ("add_marker", "add_markers_bulk")
+
+# Words are runs of letters and digits; underscores, dots and slashes split them
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(*values) -> set:
+    """Lowercase words in the given values"""
+    words = set()
+    for value in values:
+        if value:
+            words.update(_WORD.findall(str(value).lower()))
+    return words
+
+
+def _document_words(document):
+    kind = document["kind"]
+    if kind == "timeline":
+        return tokenize(document["name"])
+    if kind == "item":
+        return tokenize(document["name"], document.get("media_path"))
+    if kind == "marker":
+        return tokenize(document["name"], document["note"], document["color"])
+    return tokenize(document["name"], document.get("path"), document.get("folder"), *document.get("metadata", {}).values())
+
+
+def _signature(timeline):
+    """Duration, item count per track and marker count: enough to notice most edits without walking items"""
+    counts = [
+        len(timeline.GetItemListInTrack(track_type, index) or [])
+        for track_type in TRACK_TYPES
+        for index in range(1, (timeline.GetTrackCount(track_type) or 0) + 1)
+    ]
+    return [timeline.GetDuration()] + counts + [len(timeline.GetMarkers() or {})]
+
+
+def _marker_documents(timeline, name):
+    return [
+        {
+            "kind": "marker",
+            "timeline": name,
+            "frame": frame,
+            "duration": marker.get("duration", 1),
+            "color": marker.get("color", ""),
+            "name": marker.get("name", ""),
+            "note": marker.get("note", "")
+        }
+        for frame, marker in sorted((timeline.GetMarkers() or {}).items())
+    ]
+
+
+def _walk_timeline(timeline, name, clip_paths):
+    """Timeline and item documents, marker documents and signature for one timeline"""
+    documents = [{"kind": "timeline", "timeline": name, "name": name}]
+    counts = []
+    for track_type in TRACK_TYPES:
+        for index in range(1, (timeline.GetTrackCount(track_type) or 0) + 1):
+            items = timeline.GetItemListInTrack(track_type, index) or []
+            counts.append(len(items))
+            for item in items:
+                media_pool_item = item.GetMediaPoolItem()
+                documents.append({
+                    "kind": "item",
+                    "timeline": name,
+                    "track_type": track_type,
+                    "track": index,
+                    "name": item.GetName(),
+                    "start": item.GetStart(),
+                    "end": item.GetEnd(),
+                    "media_path": clip_paths.get(media_pool_item.GetUniqueId()) if media_pool_item else None
+                })
+    markers = _marker_documents(timeline, name)
+    return documents, markers, [timeline.GetDuration()] + counts + [len(markers)]
+
+
+class SearchIndex:
+    """Word index over one project's timelines, items, markers and clips"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cache_path = None
+        self._changed = False
+        self._saved_at = None
+        self.reset()
+
+    def reset(self):
+        """Save pending changes and forget everything; the next update loads the open project's cache file"""
+        with self._lock:
+            self.flush()
+            self._project = None
+            self._cache_path = None
+            self._cache_key = None
+            self._documents = {}
+            self._words = {}
+            self._postings = {}
+            self._vocabulary = None
+            self._timelines = {}
+            self._clips = {}
+            self._next_id = 0
+            self._dirty = {}
+            self._verify = True
+            self._clips_dirty = True
+            self._changed = False
+
+    def mark(self, command_type, params=None):
+        """Note that a mutating command ran; costs no Resolve calls"""
+        with self._lock:
+            if self._project is None or command_type in NON_EDITING_COMMANDS:
+                return
+            if command_type in BROAD_COMMANDS:
+                self._verify = True
+            target = (params or {}).get("timeline_name") or CURRENT_TIMELINE
+            markers_only = command_type in MARKER_COMMANDS
+            self._dirty[target] = self._dirty.get(target, True) and markers_only
+            if not markers_only:
+                self._clips_dirty = True
+
+    def _add(self, document):
+        document_id = self._next_id
+        self._next_id += 1
+        words = _document_words(document)
+        self._documents[document_id] = document
+        self._words[document_id] = words
+        for word in words:
+            self._postings.setdefault(word, set()).add(document_id)
+        self._vocabulary = None
+        self._changed = True
+        return document_id
+
+    def _remove(self, document_ids):
+        for document_id in document_ids:
+            self._documents.pop(document_id, None)
+            for word in self._words.pop(document_id, ()):
+                postings = self._postings.get(word)
+                if postings is not None:
+                    postings.discard(document_id)
+                    if not postings:
+                        del self._postings[word]
+        self._vocabulary = None
+        self._changed = True
+
+    def _drop_timeline(self, name):
+        segment = self._timelines.pop(name, None)
+        if segment:
+            self._remove(segment["ids"] + segment["marker_ids"])
+
+    def _index_timeline(self, name, timeline, clip_paths):
+        self._drop_timeline(name)
+        documents, markers, signature = _walk_timeline(timeline, name, clip_paths)
+        self._timelines[name] = {
+            "signature": signature,
+            "ids": [self._add(document) for document in documents],
+            "marker_ids": [self._add(document) for document in markers]
+        }
+
+    def _index_markers(self, name, timeline):
+        segment = self._timelines[name]
+        self._remove(segment["marker_ids"])
+        segment["marker_ids"] = [self._add(document) for document in _marker_documents(timeline, name)]
+        segment["signature"][-1] = len(segment["marker_ids"])
+
+    def update(self, connection, full=False) -> dict:
+        """Bring the index up to date, walking only timelines and clips that changed"""
+        with self._lock:
+            start = time.perf_counter()
+            project = connection.project
+            # Compared by ID: batches hand out a wrapper around the same project handle
+            key = connection.project_key
+            if key != self._project:
+                self.reset()
+                self._project = key
+                self._load(key)
+
+            names = connection.timeline_names()
+            for name in [name for name in self._timelines if name not in names]:
+                self._drop_timeline(name)
+
+            targets = set(names) if full else {name for name in names if name not in self._timelines}
+            dirty = dict(self._dirty)
+            if CURRENT_TIMELINE in dirty:
+                current = project.GetCurrentTimeline()
+                markers_only = dirty.pop(CURRENT_TIMELINE)
+                if current:
+                    dirty[current.GetName()] = dirty.get(current.GetName(), True) and markers_only
+            targets.update(name for name, markers_only in dirty.items() if not markers_only and name in names)
+            marker_targets = {name for name, markers_only in dirty.items() if markers_only and name in names} - targets
+            verified = 0
+            if self._verify and not full:
+                for name in names:
+                    if name in targets:
+                        continue
+                    timeline = connection.find_timeline(name)
+                    verified += 1
+                    if timeline and _signature(timeline) != self._timelines[name]["signature"]:
+                        targets.add(name)
+
+            clip_rows = connection.media_pool_clips() if targets or full or self._clips_dirty or self._verify else None
+            clip_paths = {row["uid"]: row["path"] for row in clip_rows or ()}
+            for name in targets:
+                timeline = connection.find_timeline(name)
+                if timeline:
+                    self._index_timeline(name, timeline, clip_paths)
+            for name in marker_targets:
+                timeline = connection.find_timeline(name)
+                if timeline:
+                    self._index_markers(name, timeline)
+
+            clips_read = self._update_clips(connection, clip_rows, full) if clip_rows is not None else 0
+
+            self._dirty = {}
+            self._verify = False
+            self._clips_dirty = False
+            if self._changed and (self._saved_at is None or time.monotonic() - self._saved_at >= SAVE_INTERVAL):
+                self.flush()
+            return {
+                "timelines_walked": len(targets),
+                "marker_reads": len(marker_targets),
+                "timelines_verified": verified,
+                "clips_read": clips_read,
+                "documents": len(self._documents),
+                "ms": round((time.perf_counter() - start) * 1000, 2)
+            }
+
+    def _update_clips(self, connection, rows, full):
+        """Index new or renamed clips; metadata costs one call per clip, so known clips are kept"""
+        seen = {row["uid"] for row in rows}
+        for uid in [uid for uid in self._clips if uid not in seen]:
+            self._remove([self._clips.pop(uid)])
+
+        stale = []
+        for row in rows:
+            document_id = self._clips.get(row["uid"])
+            document = self._documents.get(document_id) if document_id is not None else None
+            if full or document is None or (document["name"], document["path"], document["folder"]) != (row["name"], row["path"], row["folder"]):
+                stale.append(row)
+        if not stale:
+            return 0
+
+        items = connection.find_clips([row["uid"] for row in stale])
+        for row in stale:
+            if row["uid"] in self._clips:
+                self._remove([self._clips.pop(row["uid"])])
+            item = items.get(row["uid"])
+            metadata = (item.GetMetadata() or {}) if item else {}
+            self._clips[row["uid"]] = self._add({
+                "kind": "clip",
+                "name": row["name"],
+                "path": row["path"],
+                "folder": row["folder"],
+                "uid": row["uid"],
+                "metadata": {key: str(value) for key, value in metadata.items() if value}
+            })
+        return len(stale)
+
+    def search(self, query, kinds=None, timeline_name=None, limit=50) -> dict:
+        """Documents containing a word starting with each query word, best matches first"""
+        unknown = [kind for kind in kinds or () if kind not in DOCUMENT_KINDS]
+        if unknown:
+            raise Exception(f"Unknown result kinds: {', '.join(unknown)}; use {', '.join(DOCUMENT_KINDS)}")
+        with self._lock:
+            start = time.perf_counter()
+            query_words = sorted(tokenize(query))
+            if not query_words:
+                raise Exception("query must contain at least one letter or digit")
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+
+            matched = None
+            for query_word in query_words:
+                ids = set()
+                # Words sharing the query word as a prefix sit next to each other in the sorted vocabulary
+                position = bisect.bisect_left(self._vocabulary, query_word)
+                while position < len(self._vocabulary) and self._vocabulary[position].startswith(query_word):
+                    ids |= self._postings[self._vocabulary[position]]
+                    position += 1
+                matched = ids if matched is None else matched & ids
+                if not matched:
+                    break
+
+            results = [
+                document_id for document_id in matched or ()
+                if (not kinds or self._documents[document_id]["kind"] in kinds)
+                and (not timeline_name or self._documents[document_id].get("timeline") == timeline_name)
+            ]
+            # Whole-word matches rank above prefix matches
+            results.sort(key=lambda document_id: (
+                -len(self._words[document_id].intersection(query_words)),
+                DOCUMENT_KINDS.index(self._documents[document_id]["kind"]),
+                self._documents[document_id].get("timeline") or "",
+                self._documents[document_id].get("start", self._documents[document_id].get("frame", 0)),
+                self._documents[document_id]["name"]
+            ))
+
+            timelines = {}
+            for document_id in results:
+                document = self._documents[document_id]
+                if document["kind"] in ("item", "marker"):
+                    timelines[document["timeline"]] = timelines.get(document["timeline"], 0) + 1
+            return {
+                "query": query,
+                "total": len(results),
+                "results": [self._documents[document_id] for document_id in results[:limit]],
+                "timelines": timelines,
+                "query_ms": round((time.perf_counter() - start) * 1000, 3)
+            }
+
+    def _load(self, key):
+        """Start from the project's cache file, if there is one; every timeline is verified on first use"""
+        if not key or not CACHE_DIR:
+            return
+        self._cache_key = key
+        self._cache_path = os.path.join(CACHE_DIR, "search", hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".json")
+        try:
+            with open(self._cache_path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index {self._cache_path}: {str(e)}")
+            return
+        if data.get("format") != CACHE_FORMAT or data.get("project") != key:
+            return
+
+        for name, segment in data.get("timelines", {}).items():
+            self._timelines[name] = {
+                "signature": segment["signature"],
+                "ids": [self._add(document) for document in segment["documents"] if document["kind"] != "marker"],
+                "marker_ids": [self._add(document) for document in segment["documents"] if document["kind"] == "marker"]
+            }
+        for document in data.get("clips", []):
+            self._clips[document["uid"]] = self._add(document)
+        self._changed = False
+        logger.info(f"Loaded search index with {len(self._documents)} documents from {self._cache_path}")
+
+    def flush(self):
+        """Write pending changes to the cache file now"""
+        with self._lock:
+            if self._changed:
+                self._save()
+                self._changed = False
+                self._saved_at = time.monotonic()
+
+    def _save(self):
+        """Write the index to the project's cache file, replacing it atomically"""
+        if not self._cache_path:
+            return
+        data = {
+            "format": CACHE_FORMAT,
+            "project": self._cache_key,
+            "timelines": {
+                name: {
+                    "signature": segment["signature"],
+                    "documents": [self._documents[i] for i in segment["ids"] + segment["marker_ids"]]
+                }
+                for name, segment in self._timelines.items()
+            },
+            "clips": [self._documents[document_id] for document_id in self._clips.values()]
+        }
+        directory = os.path.dirname(self._cache_path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8") as handle:
+                json.dump(data, handle, separators=(",", ":"))
+            os.replace(handle.name, self._cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save search index to {self._cache_path}: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "words": len(self._postings),
+                "timelines": len(self._timelines),
+                "clips": len(self._clips),
+                "cache_file": self._cache_path
+            }
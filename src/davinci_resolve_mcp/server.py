@@ -18,14 +18,19 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger("DaVinciMCPServer")
 
 # Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import connection management using absolute imports
 from src.davinci_resolve_mcp.connection import (
+    get_connection_pool,
     get_davinci_connection,
     davinci_connection
 )
 
+from src.davinci_resolve_mcp.script_workers import script_workers
+
 # Import tools registration
 from src.davinci_resolve_mcp.tools import register_tools
 
@@ -33,12 +38,10 @@ from src.davinci_resolve_mcp.tools import register_tools
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     """Manage the lifecycle of the MCP server and DaVinci Resolve connection"""
     
-    # Initialize connection
+    # Connect in the background so startup never waits on Resolve
     logger.info("Initializing DaVinci Resolve connection")
-    
-    if not get_davinci_connection().connect():
-        logger.error("Failed to connect to DaVinci Resolve")
-        raise ConnectionError("Could not connect to DaVinci Resolve")
+    pool = get_connection_pool()
+    get_davinci_connection()
     
     logger.info("DaVinci Resolve MCP Server started successfully")
     
@@ -46,6 +49,8 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     
     # Cleanup on shutdown
     logger.info("Shutting down DaVinci Resolve MCP Server")
+    pool.close()
+    script_workers.close()
 
 # Setup the MCP server
 mcp = FastMCP(lifespan=server_lifespan)
@@ -0,0 +1,70 @@
+"""
+Single-flight coalescing of identical read commands.
+
+When several tool calls ask the same question of the same connection while
+the first is still queued or running, they all wait on that one execution
+instead of each walking Resolve again. Only read-only commands coalesce, and
+a mutating command closes the window: reads that arrive after it start a
+fresh execution so they see its effects.
+"""
+import asyncio
+import logging
+import os
+
+# Configure logging
+logger = logging.getLogger("DaVinciSingleFlight")
+
+# Set DAVINCI_RESOLVE_MCP_COALESCE=0 to run every call separately
+COALESCE = os.environ.get("DAVINCI_RESOLVE_MCP_COALESCE", "1") != "0"
+
+
+class SingleFlight:
+    """Share one in-flight execution among concurrent calls with the same key"""
+
+    def __init__(self):
+        self._calls = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def run(self, key, start, timeout=None):
+        """Await the execution for key, calling start() to begin one if none is in flight
+
+        start must return an asyncio future. A caller that times out or is
+        cancelled stops waiting without disturbing the others; the execution
+        itself is cancelled only once nobody is waiting for it, so a command
+        still queued behind Resolve work never starts.
+        """
+        call = self._calls.get(key) if COALESCE else None
+        if call is None:
+            call = {"future": start(), "waiters": 0}
+            self.executions += 1
+            if COALESCE:
+                self._calls[key] = call
+                call["future"].add_done_callback(lambda _: self._drop(key, call))
+        else:
+            self.shared += 1
+
+        call["waiters"] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call["future"]), timeout)
+        finally:
+            call["waiters"] -= 1
+            if not call["waiters"] and not call["future"].done():
+                call["future"].cancel()
+                self._drop(key, call)
+
+    def _drop(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def forget(self):
+        """Let later calls start fresh executions; callers already waiting keep theirs"""
+        self._calls.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": COALESCE,
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "shared": self.shared
+        }
@@ -1,94 +1,69 @@
-import json
+import inspect
 import logging
 import sys
 import os
+from typing import Optional
 from mcp.server.fastmcp import Context
 
 # Configure logging
 logger = logging.getLogger("DaVinciMCPTools")
 
 # Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import connection functionality using absolute imports
-from src.davinci_resolve_mcp.connection import get_davinci_connection
+from src.davinci_resolve_mcp.connection import get_connection_pool, ALL_TARGETS
+from src.davinci_resolve_mcp.commands.registry import COMMANDS
+from src.davinci_resolve_mcp.responses import encode_response
 
-def register_tools(mcp):
-    """Register all MCP tools with the FastMCP instance"""
-    
-    @mcp.tool()
-    def get_project_info(ctx: Context) -> str:
-        """Get information about the current DaVinci Resolve project"""
-        try:
-            connection = get_davinci_connection()
-            result = connection.execute_command("get_project_info")
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error: {str(e)}"
+def _tool_description(spec) -> str:
+    """Build a tool docstring from a command's description and parameter schema"""
+    lines = [spec.description, "", "Args:"]
+    lines += [f"    {param.name}: {param.description}" for param in spec.params]
+    lines.append(f"    target: {_target_description(spec)}")
+    return "\n".join(lines)
 
-    @mcp.tool()
-    def get_timeline_info(ctx: Context, timeline_name: str = None) -> str:
-        """
-        Get information about a specific timeline or the current timeline
-        
-        Args:
-            timeline_name: The name of the timeline to get info on (optional, uses current timeline if not specified)
-        """
-        try:
-            connection = get_davinci_connection()
-            result = connection.execute_command("get_timeline_info", {"name": timeline_name})
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error: {str(e)}"
+def _target_description(spec) -> str:
+    description = "The Resolve instance to run on (optional, uses the first configured target if not specified)"
+    if spec.read_only:
+        description += f"; \"{ALL_TARGETS}\" runs it on every target and returns the results by target"
+    return description
 
-    @mcp.tool()
-    def create_timeline(
-        ctx: Context,
-        name: str,
-        width: int = 1920,
-        height: int = 1080,
-        frame_rate: float = 24.0,
-        set_as_current: bool = True
-    ) -> str:
-        """
-        Create a new timeline in the current project
-        
-        Args:
-            name: The name of the new timeline
-            width: The width of the timeline in pixels (default: 1920)
-            height: The height of the timeline in pixels (default: 1080)
-            frame_rate: The frame rate of the timeline (default: 24.0)
-            set_as_current: Whether to set the new timeline as the current timeline (default: True)
-        """
+def _make_tool(spec):
+    """Build a FastMCP tool function that forwards to a registered command"""
+    async def tool(ctx: Context, target: Optional[str] = None, **params) -> str:
         try:
-            connection = get_davinci_connection()
-            result = connection.execute_command("create_timeline", {
-                "name": name,
-                "width": width,
-                "height": height,
-                "frame_rate": frame_rate,
-                "set_as_current": set_as_current
-            })
-            return json.dumps(result, indent=2)
+            result = await get_connection_pool().execute_command_async(spec.name, params, target)
+            return encode_response(result)
         except Exception as e:
             return f"Error: {str(e)}"
+    
+    # FastMCP builds the tool's input schema from the signature
+    parameters = [inspect.Parameter("ctx", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Context)]
+    for param in spec.params:
+        parameters.append(inspect.Parameter(
+            param.name,
+            inspect.Parameter.KEYWORD_ONLY,
+            default=inspect.Parameter.empty if param.required else param.default,
+            annotation=Optional[param.type] if param.default is None else param.type
+        ))
+    parameters.append(inspect.Parameter("target", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str]))
+    tool.__signature__ = inspect.Signature(parameters, return_annotation=str)
+    tool.__annotations__ = {p.name: p.annotation for p in parameters}
+    tool.__annotations__["return"] = str
+    tool.__name__ = spec.tool_name
+    tool.__doc__ = _tool_description(spec)
+    return tool
 
-    @mcp.tool()
-    def execute_davinci_resolve_script(ctx: Context, code: str) -> str:
-        """
-        Execute arbitrary Python code in the DaVinci Resolve context
-        
-        Args:
-            code: The Python code to execute
-        """
-        try:
-            connection = get_davinci_connection()
-            result = connection.execute_command("execute_script", {"code": code})
-            return json.dumps(result, indent=2)
-        except Exception as e:
-            return f"Error: {str(e)}"
-            
-    # Additional tools can be added here for the other command types
+def register_tools(mcp):
+    """Register all MCP tools with the FastMCP instance"""
+    
+    # One tool per registered command
+    for spec in COMMANDS.values():
+        if spec.expose:
+            mcp.tool(name=spec.tool_name, description=_tool_description(spec))(_make_tool(spec))
     
     @mcp.prompt()
     def video_editing_strategy() -> str: